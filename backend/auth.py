@@ -3,24 +3,27 @@ from typing import Optional
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from database import SessionLocal
+from cache import TTLCache
+from database import get_async_db, get_db
 from models import Users
-from utils import verify_pwd
+from utils import verify_pwd_async
 import os
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "1024"))
+# Comma-separated emails allowed to use the /admin endpoints.
+ADMIN_EMAILS = {email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()}
 
-security = HTTPBearer()
+# Resolved Users rows keyed by token subject (email); rows are detached from their session.
+user_cache = TTLCache(maxsize=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL_SECONDS)
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+security = HTTPBearer()
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -48,19 +51,47 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
     except JWTError:
         raise credentials_exception
 
-def authenticate_user(db: Session, email: str, password: str):
-    user = db.query(Users).filter(Users.email == email).first()
+async def authenticate_user(db: AsyncSession, email: str, password: str):
+    user = await db.scalar(select(Users).where(Users.email == email).limit(1))
     if not user:
         return False
-    if not verify_pwd(password, user.hashed_password):
+    if not await verify_pwd_async(password, user.hashed_password):
         return False
     return user
 
-def get_current_user(token_email: str = Depends(verify_token), db: Session = Depends(get_db)):
-    user = db.query(Users).filter(Users.email == token_email).first()
+def invalidate_cached_user(*emails: Optional[str]) -> None:
+    for email in emails:
+        if email:
+            user_cache.invalidate(email)
+
+def _cache_resolved_user(db, token_email: str, user: Optional[Users]) -> Users:
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
-    return user
\ No newline at end of file
+    db.expunge(user)
+    user_cache.set(token_email, user)
+    return user
+
+def get_current_user(token_email: str = Depends(verify_token), db: Session = Depends(get_db)):
+    user = user_cache.get(token_email)
+    if user is not None:
+        return user
+    user = db.query(Users).filter(Users.email == token_email).first()
+    return _cache_resolved_user(db, token_email, user)
+
+async def get_current_user_async(token_email: str = Depends(verify_token), db: AsyncSession = Depends(get_async_db)):
+    user = user_cache.get(token_email)
+    if user is not None:
+        return user
+    user = await db.scalar(select(Users).where(Users.email == token_email).limit(1))
+    return _cache_resolved_user(db, token_email, user)
+
+async def get_admin_user(current_user: Users = Depends(get_current_user_async)):
+    if (current_user.email or "").lower() not in ADMIN_EMAILS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return current_user
@@ -0,0 +1,120 @@
+# Compares the response_model path with the fast serialization path for project lists.
+#
+#     python benchmarks/bench_serialization.py [--projects 200] [--events 3] [--repeat 20]
+#
+# Runs on in-memory ORM objects, so no database is needed.
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from models import Project, ProjectEvent, ProjectType, Users  # noqa: E402
+from schemas import Project as ProjectSchema  # noqa: E402
+from serialization import FastJSONResponse, project_list  # noqa: E402
+
+
+def build_projects(count: int, events_per_project: int) -> List[Project]:
+    now = datetime.now(timezone.utc)
+    owner = Users(id=str(uuid.uuid4()), name="Owner", email="owner@example.org", phonenumber="5550100")
+    projects = []
+    for index in range(count):
+        project = Project(
+            id=str(uuid.uuid4()),
+            owner_id=owner.id,
+            owner=owner,
+            title=f"Project {index}",
+            short_description="Short description " * 4,
+            detailed_description="Detailed description " * 40,
+            category="Education",
+            project_type=ProjectType.HYBRID,
+            location="Nairobi",
+            image_url="/volunteer-project.jpg",
+            skills_needed=["Python", "Teaching", "Design"],
+            start_date=date(2026, 1, 1),
+            end_date=date(2026, 12, 31),
+            created_at=now - timedelta(minutes=index),
+            updated_at=now,
+        )
+        for event_index in range(events_per_project):
+            project.events.append(
+                ProjectEvent(
+                    id=str(uuid.uuid4()),
+                    name=f"Session {event_index}",
+                    description="Weekly session",
+                    date=date(2026, 2, 1) + timedelta(days=7 * event_index),
+                    time="10:00",
+                    slots_available=12,
+                    created_at=now,
+                    updated_at=now,
+                )
+            )
+        projects.append(project)
+    return projects
+
+
+def response_model_path(adapter: TypeAdapter, projects: List[Project]) -> bytes:
+    # What FastAPI does for response_model=List[ProjectSchema]: validate from attributes, then dump.
+    validated = adapter.validate_python(projects, from_attributes=True)
+    return JSONResponse(adapter.dump_python(validated, mode="json")).body
+
+
+def response_model_dump_json_path(adapter: TypeAdapter, projects: List[Project]) -> bytes:
+    # Newer FastAPI releases serialize straight to bytes after validation.
+    return adapter.dump_json(adapter.validate_python(projects, from_attributes=True))
+
+
+def fast_path(projects: List[Project]) -> bytes:
+    return FastJSONResponse(project_list(projects)).body
+
+
+def measure(fn, repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare project list serialization paths.")
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--events", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    projects = build_projects(args.projects, args.events)
+    adapter = TypeAdapter(List[ProjectSchema])
+
+    baseline = response_model_path(adapter, projects)
+    if json.loads(fast_path(projects)) != json.loads(baseline):
+        sys.exit("fast path output differs from the response_model output")
+
+    paths = {
+        "response_model + JSONResponse": lambda: response_model_path(adapter, projects),
+        "response_model + dump_json": lambda: response_model_dump_json_path(adapter, projects),
+        "dict rows + FastJSONResponse": lambda: fast_path(projects),
+    }
+    print(f"{args.projects} projects x {args.events} events, {len(baseline)} bytes, {args.repeat} runs")
+    reference = None
+    for label, fn in paths.items():
+        fn()  # warm-up
+        median = statistics.median(measure(fn, args.repeat))
+        reference = reference or median
+        print(f"  {label:<32} median {median:8.2f} ms  ({reference / median:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
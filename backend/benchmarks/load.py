@@ -0,0 +1,164 @@
+# Drives every route with concurrent clients and reports latency, throughput and
+# SQL statements per request.
+#
+#     python benchmarks/seed.py --reset
+#     python benchmarks/load.py --requests 200 --concurrency 10 [--routes projects] [--json out.json]
+#
+# By default the app runs in-process behind httpx's ASGI transport, with outgoing
+# email stubbed out and uploaded images written to a temporary directory. Pass --url
+# to target a running server instead; per-request query counts are only available
+# in-process, and the server's ADMIN_EMAILS must list bench-user-0@example.org
+# for the /admin routes to succeed.
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx  # noqa: E402
+
+from database import SessionLocal, async_engine, engine  # noqa: E402
+from scenarios import BENCH_ADMIN_EMAIL, SCENARIOS, Fixtures, Scenario, count_queries  # noqa: E402
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return math.nan
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    fixtures: Fixtures,
+    requests: int,
+    concurrency: int,
+    query_counts: Optional[List[int]],
+) -> Optional[dict]:
+    latencies: List[float] = []
+    errors: List[str] = []
+    next_index = iter(range(requests))
+    if query_counts is not None:
+        query_counts.clear()
+
+    async def worker():
+        for n in next_index:
+            request = scenario.build(fixtures, n)
+            if request is None:
+                return
+            method, url, kwargs = request
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code not in scenario.expected:
+                errors.append(f"{response.status_code} {response.text[:120]}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    if not latencies:
+        return None
+
+    latencies.sort()
+    result = {
+        "route": scenario.name,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "throughput_rps": len(latencies) / elapsed,
+        "queries_per_request": sum(query_counts) / len(query_counts) if query_counts else None,
+        "max_queries": max(query_counts) if query_counts else None,
+    }
+    if errors:
+        result["first_error"] = errors[0]
+    return result
+
+
+def print_report(results: List[dict]) -> None:
+    header = f"{'route':<48} {'n':>5} {'err':>4} {'p50':>8} {'p95':>8} {'p99':>8} {'req/s':>8} {'q/req':>6} {'qmax':>5}"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        queries = "-" if row["queries_per_request"] is None else f"{row['queries_per_request']:.1f}"
+        max_queries = "-" if row["max_queries"] is None else str(row["max_queries"])
+        print(
+            f"{row['route']:<48} {row['requests']:>5} {row['errors']:>4} "
+            f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} "
+            f"{row['throughput_rps']:>8.1f} {queries:>6} {max_queries:>5}"
+        )
+    for row in results:
+        if row.get("first_error"):
+            print(f"{row['route']}: {row['errors']} unexpected responses, e.g. {row['first_error']}", file=sys.stderr)
+
+
+async def run(args) -> List[dict]:
+    db = SessionLocal()
+    try:
+        fixtures = Fixtures(db)
+    finally:
+        db.close()
+
+    scenarios = [scenario for scenario in SCENARIOS if not args.routes or any(part in scenario.name for part in args.routes)]
+    query_counts: Optional[List[int]] = None
+    if args.url:
+        transport = None
+        base_url = args.url
+    else:
+        import main
+        from auth import ADMIN_EMAILS
+        from images import shutdown_image_pool
+
+        ADMIN_EMAILS.add(BENCH_ADMIN_EMAIL)
+        main.ensure_schema()
+        main.mail_dispatcher.enqueue = lambda message: None
+        query_counts = []
+        transport = httpx.ASGITransport(app=count_queries(main.app, [engine, async_engine.sync_engine], query_counts))
+        base_url = "http://bench"
+
+    results = []
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=60) as client:
+            for scenario in scenarios:
+                result = await run_scenario(client, scenario, fixtures, args.requests, args.concurrency, query_counts)
+                if result is None:
+                    print(f"{scenario.name}: skipped, fixtures exhausted", file=sys.stderr)
+                    continue
+                results.append(result)
+    finally:
+        if not args.url:
+            # Let running renders finish before the temporary upload directory goes away.
+            shutdown_image_pool(wait=True)
+            await async_engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test every API route.")
+    parser.add_argument("--requests", type=int, default=200, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--routes", nargs="*", help="only run routes whose name contains one of these")
+    parser.add_argument("--url", help="base URL of a running server (default: run the app in-process)")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="load-uploads-") as upload_root:
+        # Read when main (and images) are imported for the in-process run.
+        os.environ["UPLOAD_ROOT"] = upload_root
+        results = asyncio.run(run(args))
+    print_report(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# Runs mailer.MailDispatcher against a local aiosmtpd server and checks that it
+# delivers everything over a few pooled sessions, retries transient failures and
+# survives unsendable messages. Needs aiosmtpd (pip install aiosmtpd).
+#
+#     python benchmarks/mail_check.py [--messages 500] [--workers 2]
+#
+# Besides the regular messages it sends one that the server rejects once with a
+# 451 (must arrive after a retry) and one with no recipients (must be counted as
+# failed without killing its worker). Exits non-zero if any check fails.
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import threading
+import time
+from email.message import EmailMessage
+from pathlib import Path
+
+from aiosmtpd.controller import Controller
+
+RETRY_RECIPIENT = "retry@example.org"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Check the outbound mail queue against a local SMTP server.")
+    parser.add_argument("--messages", type=int, default=500, help="regular messages to send")
+    parser.add_argument("--workers", type=int, default=2, help="MAIL_WORKERS for the dispatcher")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds to wait for delivery")
+    return parser.parse_args()
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.delivered = []
+        self.sessions = set()
+        self.rejected_once = False
+        self._lock = threading.Lock()
+
+    async def handle_DATA(self, server, session, envelope):
+        with self._lock:
+            self.sessions.add(id(session))
+            if RETRY_RECIPIENT in envelope.rcpt_tos and not self.rejected_once:
+                self.rejected_once = True
+                return "451 Try again later"
+            self.delivered.append(envelope.rcpt_tos)
+        return "250 Message accepted"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def message(recipient: str, n: int) -> EmailMessage:
+    msg = EmailMessage()
+    msg["Subject"] = f"Mail check {n}"
+    msg["From"] = "noreply@example.org"
+    if recipient:
+        msg["To"] = recipient
+    msg.set_content(f"<p>Message {n}</p>", subtype="html")
+    return msg
+
+
+async def run(args, handler: RecordingHandler) -> list:
+    from mailer import MailDispatcher
+
+    dispatcher = MailDispatcher()
+    await dispatcher.start()
+    started = time.perf_counter()
+
+    def produce():
+        # enqueue() is called from handler threads in the app, so do the same here.
+        for n in range(args.messages):
+            dispatcher.enqueue(message(f"volunteer-{n}@example.org", n))
+        dispatcher.enqueue(message(RETRY_RECIPIENT, args.messages))
+        dispatcher.enqueue(message("", args.messages + 1))
+
+    await asyncio.to_thread(produce)
+    expected_sent = args.messages + 1
+    deadline = time.monotonic() + args.timeout
+    while dispatcher.stats["sent"] + dispatcher.stats["failed"] < expected_sent + 1 and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+    elapsed = time.perf_counter() - started
+
+    stats = dict(dispatcher.stats)
+    alive = sum(not worker.done() for worker in dispatcher._workers)
+    await dispatcher.stop()
+
+    print(f"{stats['sent']} sent in {elapsed:.2f}s ({stats['sent'] / elapsed:.0f} msg/s) over {len(handler.sessions)} SMTP sessions")
+    print(f"stats: {stats}")
+    problems = []
+    if stats["sent"] != expected_sent or len(handler.delivered) != expected_sent:
+        problems.append(f"expected {expected_sent} delivered, got {stats['sent']} sent / {len(handler.delivered)} received")
+    if stats["failed"] != 1:
+        problems.append(f"expected the recipient-less message to count as 1 failure, got {stats['failed']}")
+    if stats["retried"] != 1 or not any(RETRY_RECIPIENT in rcpts for rcpts in handler.delivered):
+        problems.append(f"expected the 451 message to be delivered after 1 retry, got {stats['retried']} retries")
+    if stats["dropped"]:
+        problems.append(f"{stats['dropped']} messages dropped")
+    if alive != args.workers:
+        problems.append(f"only {alive} of {args.workers} workers still running")
+    # One session per worker, plus the one reopened after the 451.
+    if len(handler.sessions) > args.workers + 1:
+        problems.append(f"{len(handler.sessions)} SMTP sessions for {args.workers} workers")
+    return problems
+
+
+def main() -> None:
+    args = parse_args()
+    port = free_port()
+    # Read when mailer is imported.
+    os.environ.update({
+        "MAIL_SERVER": "127.0.0.1",
+        "MAIL_PORT": str(port),
+        "MAIL_STARTTLS": "false",
+        "MAIL_SSL_TLS": "false",
+        "MAIL_UNAME": "",
+        "MAIL_PASSWORD": "",
+        "MAIL_FROM": "noreply@example.org",
+        "MAIL_WORKERS": str(args.workers),
+        "MAIL_QUEUE_LIMIT": str(args.messages + 10),
+        "MAIL_RETRY_BASE_SECONDS": "0.05",
+    })
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        problems = asyncio.run(run(args, handler))
+    finally:
+        controller.stop()
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    if not problems:
+        print("Mail queue checks passed")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
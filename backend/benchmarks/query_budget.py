@@ -0,0 +1,159 @@
+# Checks every route's SQL statement count against its declared budget, on
+# datasets of growing size.
+#
+#     python benchmarks/query_budget.py [--scales 1 4] [--requests 5] [--routes volunteers]
+#
+# For each scale the database is reset and re-seeded with benchmarks/seed.py
+# (rows per table grow with the scale), then each scenario is sent sequentially
+# and the worst per-request statement count is kept. A route fails when:
+#   - its count rises with the dataset size (an N+1 or per-row query), or
+#   - its count exceeds the max_queries budget declared in scenarios.py, or
+#   - it declares no budget, or returns an unexpected status.
+# Exits non-zero on any failure, so it can gate CI.
+#
+# By default it runs against a throwaway SQLite file. --database-url points it
+# at another database, e.g. PostgreSQL; that database is DROPPED and re-seeded.
+# Uploaded images always go to a throwaway directory.
+#
+# The slow-query log is switched on with a near-zero threshold, so every route runs
+# with its statements timed and EXPLAINed, and the seeded bench-user-0 is an admin,
+# so GET /admin/slow-queries is budgeted on its 200 path with real entries.
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Check per-route SQL statement budgets.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 4], help="dataset sizes to compare")
+    parser.add_argument("--requests", type=int, default=5, help="requests per route and scale")
+    parser.add_argument("--routes", nargs="*", help="only check routes whose name contains one of these")
+    parser.add_argument("--database-url", help="database to reset and seed (default: a temporary SQLite file)")
+    return parser.parse_args()
+
+
+def dataset(scale: int) -> dict:
+    return {
+        "users": 60 * scale,
+        "projects": 10 * scale,
+        "events": 2 * scale,
+        "applications": 5 * scale,
+        "volunteers": 2 * scale,
+        "notifications": 3 * scale,
+    }
+
+
+async def measure(client, scenarios, fixtures, requests: int, sink: List[int], clear_caches) -> Dict[str, dict]:
+    results = {}
+    for scenario in scenarios:
+        sink.clear()
+        unexpected = []
+        for n in range(requests):
+            request = scenario.build(fixtures, n)
+            if request is None:
+                break
+            method, url, kwargs = request
+            clear_caches()
+            response = await client.request(method, url, **kwargs)
+            if response.status_code not in scenario.expected:
+                unexpected.append(f"{response.status_code} {response.text[:120]}")
+        results[scenario.name] = {"max": max(sink) if sink else None, "unexpected": unexpected}
+    return results
+
+
+async def run(args) -> int:
+    # Imported only now: database.py builds its engines from DATABASE_URL at import time.
+    import httpx
+
+    import main
+    from auth import ADMIN_EMAILS, user_cache
+    from database import SessionLocal, async_engine, engine
+    from images import shutdown_image_pool
+    from scenarios import BENCH_ADMIN_EMAIL, SCENARIOS, Fixtures, count_queries
+    from seed import reset_database, seed
+
+    ADMIN_EMAILS.add(BENCH_ADMIN_EMAIL)
+    # Every statement is "slow" here; keep the per-statement warnings out of the report.
+    logging.getLogger("slow_queries").setLevel(logging.ERROR)
+    scenarios = [scenario for scenario in SCENARIOS if not args.routes or any(part in scenario.name for part in args.routes)]
+    main.mail_dispatcher.enqueue = lambda message: None
+    sink: List[int] = []
+    app = count_queries(main.app, [engine, async_engine.sync_engine], sink)
+    by_scale: Dict[int, Dict[str, dict]] = {}
+
+    def clear_caches():
+        # Budgets are for the cold path: a cache hit would hide the auth lookup
+        # or a panel's queries depending on which fixtures the run happened to pick.
+        user_cache.clear()
+        main.analytics_cache.clear()
+
+    try:
+        for scale in args.scales:
+            reset_database()
+            main.ensure_schema()
+            db = SessionLocal()
+            try:
+                seed(db, **dataset(scale))
+                fixtures = Fixtures(db)
+            finally:
+                db.close()
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://budget") as client:
+                by_scale[scale] = await measure(client, scenarios, fixtures, args.requests, sink, clear_caches)
+    finally:
+        # Let running renders finish before the temporary upload directory goes away.
+        shutdown_image_pool(wait=True)
+        await async_engine.dispose()
+
+    failures = 0
+    smallest, largest = args.scales[0], args.scales[-1]
+    header = "  ".join(f"x{scale:<3}" for scale in args.scales)
+    print(f"{'route':<48} {header}  budget")
+    for scenario in scenarios:
+        counts = [by_scale[scale][scenario.name]["max"] for scale in args.scales]
+        problems = []
+        if any(count is None for count in counts):
+            problems.append("no requests ran (fixtures exhausted)")
+        else:
+            if max(counts) > counts[0]:
+                problems.append(f"grows with data: {counts[0]} at x{smallest}, up to {max(counts)} by x{largest}")
+            if scenario.max_queries is None:
+                problems.append("no max_queries budget declared")
+            elif max(counts) > scenario.max_queries:
+                problems.append(f"over budget: {max(counts)} > {scenario.max_queries}")
+        for scale in args.scales:
+            unexpected = by_scale[scale][scenario.name]["unexpected"]
+            if unexpected:
+                problems.append(f"unexpected response at x{scale}: {unexpected[0]}")
+
+        cells = "  ".join(f"{'-' if count is None else count:<4}" for count in counts)
+        budget = "-" if scenario.max_queries is None else scenario.max_queries
+        print(f"{scenario.name:<48} {cells}  {budget}{'  FAIL' if problems else ''}")
+        for problem in problems:
+            print(f"    {problem}")
+        failures += bool(problems)
+
+    print(f"{failures} of {len(scenarios)} routes failed" if failures else f"All {len(scenarios)} routes within budget")
+    return 1 if failures else 0
+
+
+def main() -> None:
+    args = parse_args()
+    args.scales = sorted(set(args.scales))
+    with tempfile.TemporaryDirectory(prefix="query-budget-") as workdir:
+        os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{Path(workdir) / 'query_budget.db'}"
+        # Uploaded images and their variants go here too, not into backend/uploads.
+        os.environ["UPLOAD_ROOT"] = str(Path(workdir) / "uploads")
+        # Derive the async URL from DATABASE_URL rather than any value in .env.
+        os.environ["ASYNC_DATABASE_URL"] = ""
+        os.environ["SLOW_QUERY_MS"] = "0.000001"
+        sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+        sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
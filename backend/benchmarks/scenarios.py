@@ -0,0 +1,344 @@
+# Route catalogue and fixtures shared by the benchmark and query-budget harnesses.
+#
+# Every HTTP route in main.py has a scenario here, except GET /notifications/stream,
+# which never completes. Each scenario builds the n-th request from fixtures read
+# out of a database seeded by benchmarks/seed.py.
+import io
+import json
+import random
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import event, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from auth import create_access_token  # noqa: E402
+from models import ApplicationStatus, Project, ProjectApplication, Users  # noqa: E402
+from seed import BENCH_PASSWORD, bench_email  # noqa: E402
+
+FIXTURE_SAMPLE_SIZE = 2000
+# The harnesses add this seeded user to auth.ADMIN_EMAILS for the /admin routes.
+BENCH_ADMIN_EMAIL = bench_email(0)
+
+
+class Scenario(NamedTuple):
+    name: str
+    # (fixtures, n) -> (method, url, httpx request kwargs), or None once fixtures run out.
+    build: Callable[["Fixtures", int], Optional[Tuple[str, str, dict]]]
+    expected: Tuple[int, ...] = (200,)
+    # Most SQL statements one request may issue, checked by benchmarks/query_budget.py.
+    max_queries: Optional[int] = None
+
+
+class Fixtures:
+    def __init__(self, db: Session, seed: int = 7):
+        self.rng = random.Random(seed)
+        self.run = uuid.uuid4().hex[:8]
+        self.users: List[Tuple[str, str]] = db.execute(
+            select(Users.id, Users.email).where(Users.email.like("bench-user-%")).limit(FIXTURE_SAMPLE_SIZE)
+        ).all()
+        if not self.users:
+            raise SystemExit("No seeded users found; run benchmarks/seed.py first.")
+
+        self.owner_projects: Dict[str, List[str]] = {}
+        self.owner_ids: Dict[str, str] = {}
+        for email, owner_id, project_id in db.execute(
+            select(Users.email, Users.id, Project.id).join(Project, Project.owner_id == Users.id).limit(FIXTURE_SAMPLE_SIZE)
+        ):
+            self.owner_projects.setdefault(email, []).append(project_id)
+            self.owner_ids[email] = owner_id
+        self.owners = sorted(self.owner_projects)
+        self.project_ids = [project_id for ids in self.owner_projects.values() for project_id in ids]
+        # Filters taken from a seeded project, so the filtered listing always has rows to
+        # load owners and events for; an empty page would skip those queries.
+        self.project_filter = {"limit": 50}
+        sample = db.execute(select(Project.category, Project.skills_needed).limit(1)).first()
+        if sample is not None:
+            self.project_filter["category"] = sample.category
+            if sample.skills_needed:
+                self.project_filter["skill"] = sample.skills_needed[0]
+
+        self.pending = db.execute(
+            select(ProjectApplication.project_id, ProjectApplication.id, Users.email)
+            .join(Project, ProjectApplication.project_id == Project.id)
+            .join(Users, Project.owner_id == Users.id)
+            .where(ProjectApplication.status == ApplicationStatus.PENDING)
+            .limit(FIXTURE_SAMPLE_SIZE)
+        ).all()
+        self.rng.shuffle(self.pending)
+
+        user_ids = [user_id for user_id, _ in self.users]
+        self.applied = set(
+            db.execute(
+                select(ProjectApplication.volunteer_id, ProjectApplication.project_id)
+                .where(ProjectApplication.volunteer_id.in_(user_ids))
+            ).all()
+        )
+        self._tokens: Dict[str, str] = {}
+        self._image: Optional[bytes] = None
+
+    def auth(self, email: str) -> dict:
+        token = self._tokens.get(email)
+        if token is None:
+            token = self._tokens[email] = create_access_token({"sub": email}, expires_delta=timedelta(hours=2))
+        return {"Authorization": f"Bearer {token}"}
+
+    def any_user(self) -> Tuple[str, str]:
+        return self.rng.choice(self.users)
+
+    def any_owner(self) -> Tuple[str, str]:
+        email = self.rng.choice(self.owners)
+        return email, self.rng.choice(self.owner_projects[email])
+
+    def fresh_application(self) -> Optional[Tuple[str, str]]:
+        for _ in range(50):
+            user_id, email = self.any_user()
+            project_id = self.rng.choice(self.project_ids)
+            if (user_id, project_id) not in self.applied:
+                self.applied.add((user_id, project_id))
+                return email, project_id
+        return None
+
+    def next_pending(self) -> Optional[Tuple[str, str, str]]:
+        return self.pending.pop() if self.pending else None
+
+    def image(self) -> bytes:
+        if self._image is None:
+            from PIL import Image
+
+            buffer = io.BytesIO()
+            Image.new("RGB", (1200, 800), (236, 72, 153)).save(buffer, "JPEG")
+            self._image = buffer.getvalue()
+        return self._image
+
+
+def _as_user(fx: Fixtures, method: str, url: str, **kwargs):
+    return method, url, {"headers": fx.auth(fx.any_user()[1]), **kwargs}
+
+
+def _own_projects(fx: Fixtures):
+    email, _ = fx.any_owner()
+    params = {"owner_id": fx.owner_ids[email], "limit": 200}
+    return "GET", "/projects", {"headers": fx.auth(email), "params": params}
+
+
+def _as_owner(fx: Fixtures, method: str, url_template: str, **kwargs):
+    email, project_id = fx.any_owner()
+    return method, url_template.format(project_id=project_id), {"headers": fx.auth(email), **kwargs}
+
+
+def _project_body(fx: Fixtures, n: int) -> dict:
+    return {
+        "title": f"Benchmark project {fx.run}-{n}",
+        "short_description": "Created by the benchmark harness",
+        "detailed_description": "Weekly coding sessions for girls in secondary school.",
+        "category": "Education",
+        "project_type": "Hybrid",
+        "skills_needed": ["Python", "Teaching"],
+        "start_date": "2026-01-01",
+        "end_date": "2026-06-30",
+        "image_url": "/volunteer-project.jpg",
+        "events": [{"name": "Kickoff", "date": "2026-01-05", "time": "10:00", "slots_available": 20}],
+    }
+
+
+def _import_file(fx: Fixtures, n: int, rows: int = 20) -> bytes:
+    return "".join(json.dumps(_project_body(fx, n * rows + row)) + "\n" for row in range(rows)).encode("utf-8")
+
+
+def _apply(fx: Fixtures, n: int):
+    pair = fx.fresh_application()
+    if pair is None:
+        return None
+    email, project_id = pair
+    body = {"skills": ["Python"], "message": "Happy to help"}
+    return "POST", f"/projects/{project_id}/apply", {"headers": fx.auth(email), "json": body}
+
+
+def _status_update(url_template: str, method: str):
+    def build(fx: Fixtures, n: int):
+        pending = fx.next_pending()
+        if pending is None:
+            return None
+        project_id, application_id, owner_email = pending
+        url = url_template.format(project_id=project_id, application_id=application_id)
+        body = {"status": "Accepted" if n % 2 == 0 else "Rejected"}
+        return method, url, {"headers": fx.auth(owner_email), "json": body}
+
+    return build
+
+
+# max_queries is the current cold-cache count (auth lookup included). Raise it
+# only together with the change that needs the extra statement.
+SCENARIOS: List[Scenario] = [
+    Scenario("GET /", lambda fx, n: ("GET", "/", {}), max_queries=0),
+    Scenario(
+        "POST /login",
+        lambda fx, n: ("POST", "/login", {"json": {"email": fx.any_user()[1], "password": BENCH_PASSWORD}}),
+        max_queries=1,
+    ),
+    Scenario("GET /users/", lambda fx, n: _as_user(fx, "GET", "/users/"), max_queries=2),
+    Scenario("GET /me", lambda fx, n: _as_user(fx, "GET", "/me"), max_queries=1),
+    Scenario(
+        "POST /create/user",
+        lambda fx, n: ("POST", "/create/user", {"json": {
+            "name": f"New User {n}",
+            "email": f"bench-new-{fx.run}-{n}@example.org",
+            "phonenumber": f"bench-{fx.run}-{n}",
+            "password": BENCH_PASSWORD,
+        }}),
+        max_queries=3,
+    ),
+    Scenario(
+        "POST /projects/upload-image",
+        lambda fx, n: _as_user(fx, "POST", "/projects/upload-image", files={"file": ("bench.jpg", fx.image(), "image/jpeg")}),
+        (201,),
+        max_queries=1,
+    ),
+    Scenario(
+        "PUT /update/user",
+        lambda fx, n: _as_user(fx, "PUT", "/update/user", json={"city": f"City {n % 7}"}),
+        max_queries=5,
+    ),
+    # Includes the background match fan-out, which runs before the in-process request completes.
+    Scenario(
+        "POST /create/project",
+        lambda fx, n: _as_user(fx, "POST", "/create/project", json=_project_body(fx, n)),
+        (201,),
+        max_queries=15,
+    ),
+    Scenario(
+        "POST /projects/import",
+        lambda fx, n: _as_user(
+            fx, "POST", "/projects/import", files={"file": ("bench.jsonl", _import_file(fx, n), "application/x-ndjson")}
+        ),
+        max_queries=6,
+    ),
+    Scenario("GET /projects", lambda fx, n: _as_user(fx, "GET", "/projects"), max_queries=5),
+    Scenario(
+        "GET /projects (filtered)",
+        lambda fx, n: _as_user(fx, "GET", "/projects", params=fx.project_filter),
+        max_queries=5,
+    ),
+    Scenario("GET /projects (own)", lambda fx, n: _own_projects(fx), max_queries=5),
+    Scenario(
+        "GET /projects/search",
+        lambda fx, n: _as_user(fx, "GET", "/projects/search?q=coding&limit=20"),
+        max_queries=5,
+    ),
+    Scenario("POST /projects/{id}/apply", _apply, (201,), max_queries=9),
+    Scenario(
+        "GET /projects/{id}/applications",
+        lambda fx, n: _as_owner(fx, "GET", "/projects/{project_id}/applications"),
+        max_queries=4,
+    ),
+    Scenario(
+        "GET /projects/{id}/volunteers",
+        lambda fx, n: _as_owner(fx, "GET", "/projects/{project_id}/volunteers"),
+        max_queries=5,
+    ),
+    Scenario(
+        "GET /projects/{id}/applications/export",
+        lambda fx, n: _as_owner(fx, "GET", "/projects/{project_id}/applications/export?format=" + ("csv", "ndjson")[n % 2]),
+        max_queries=3,
+    ),
+    Scenario(
+        "GET /projects/{id}/volunteers/export",
+        lambda fx, n: _as_owner(fx, "GET", "/projects/{project_id}/volunteers/export?format=" + ("csv", "ndjson")[n % 2]),
+        max_queries=3,
+    ),
+    Scenario(
+        "PATCH /projects/{id}/applications/{id}/status",
+        _status_update("/projects/{project_id}/applications/{application_id}/status", "PATCH"),
+        max_queries=10,
+    ),
+    Scenario(
+        "POST /projects/{id}/applications/{id}/status",
+        _status_update("/projects/{project_id}/applications/{application_id}/status", "POST"),
+        max_queries=10,
+    ),
+    Scenario(
+        "PATCH /applications/{id}/status",
+        _status_update("/applications/{application_id}/status", "PATCH"),
+        max_queries=11,
+    ),
+    Scenario(
+        "POST /applications/{id}/status",
+        _status_update("/applications/{application_id}/status", "POST"),
+        max_queries=11,
+    ),
+    Scenario("GET /metrics", lambda fx, n: ("GET", "/metrics", {}), max_queries=0),
+    Scenario("GET /notifications", lambda fx, n: _as_user(fx, "GET", "/notifications?limit=20"), max_queries=2),
+    Scenario(
+        "GET /notifications/unread-count",
+        lambda fx, n: _as_user(fx, "GET", "/notifications/unread-count"),
+        max_queries=2,
+    ),
+    Scenario(
+        "POST /notifications/read",
+        lambda fx, n: _as_user(fx, "POST", "/notifications/read", json={}),
+        max_queries=3,
+    ),
+    Scenario(
+        "GET /admin/slow-queries",
+        lambda fx, n: ("GET", "/admin/slow-queries", {"headers": fx.auth(BENCH_ADMIN_EMAIL)}),
+        max_queries=1,
+    ),
+    Scenario(
+        "DELETE /admin/slow-queries",
+        lambda fx, n: ("DELETE", "/admin/slow-queries", {"headers": fx.auth(BENCH_ADMIN_EMAIL)}),
+        (204,),
+        max_queries=1,
+    ),
+] + [
+    Scenario(
+        f"GET /analytics/{name}",
+        lambda fx, n, name=name: _as_owner(fx, "GET", f"/analytics/{name}?days={(30, 90, 365)[n % 3]}"),
+        max_queries=budget,
+    )
+    for name, budget in (
+        ("dashboard", 5),
+        ("overview", 2),
+        ("projects-by-category", 2),
+        ("skills-distribution", 2),
+        ("monthly-hours", 2),
+        ("application-stats", 2),
+    )
+]
+
+
+# Per-request SQL statement counts for in-process runs. count_queries() wraps the
+# ASGI app; the engine listeners attribute each statement to the active request,
+# including work done in the threadpool and in background tasks.
+_request_queries: ContextVar[Optional[List[int]]] = ContextVar("bench_request_queries", default=None)
+
+
+def _on_execute(conn, cursor, statement, parameters, context, executemany):
+    counter = _request_queries.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def count_queries(app, engines, sink: List[int]):
+    for engine in engines:
+        if not event.contains(engine, "before_cursor_execute", _on_execute):
+            event.listen(engine, "before_cursor_execute", _on_execute)
+
+    async def counted(scope, receive, send):
+        if scope["type"] != "http":
+            return await app(scope, receive, send)
+        counter = [0]
+        token = _request_queries.set(counter)
+        try:
+            await app(scope, receive, send)
+        finally:
+            _request_queries.reset(token)
+            sink.append(counter[0])
+
+    return counted
@@ -0,0 +1,260 @@
+# Seeds the database at DATABASE_URL with a synthetic, reproducible dataset.
+#
+#     python benchmarks/seed.py --users 1000 --projects 500 --events 3 \
+#         --applications 20 --volunteers 5 --notifications 5 [--reset]
+#
+# Every seeded user can log in as bench-user-<n>@example.org / BENCH_PASSWORD.
+# The first tenth of the users own all the projects.
+import argparse
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from database import Base, SessionLocal, engine  # noqa: E402
+from matching import rebuild_skill_indexes  # noqa: E402
+from models import (  # noqa: E402
+    ApplicationStatus,
+    Notification,
+    NotificationType,
+    Project,
+    ProjectApplication,
+    ProjectEvent,
+    ProjectType,
+    ProjectVolunteer,
+    Users,
+    VolunteerStatus,
+)
+from notification_counts import rebuild_unread_counts  # noqa: E402
+from rollups import rebuild_rollups  # noqa: E402
+from search import SQLITE_FTS_TABLE  # noqa: E402
+from utils import hash_pwd, uuid7  # noqa: E402
+
+BENCH_PASSWORD = "bench-password"
+BATCH_SIZE = 1000
+HISTORY_DAYS = 180
+
+SKILLS = [
+    "Python", "JavaScript", "Teaching", "Mentoring", "Design", "Marketing", "Writing",
+    "Fundraising", "Nursing", "Counseling", "Photography", "Accounting", "Translation", "Data Analysis",
+]
+CATEGORIES = ["Education", "Health", "Technology", "Environment", "Arts", "Community", "Economic Empowerment"]
+TOPICS = ["coding club", "health fair", "mentorship circle", "tree planting", "art workshop", "savings group"]
+CITIES = ["Nairobi", "Lagos", "Accra", "Kigali", "Cairo", "Addis Ababa", None]
+
+
+def bench_email(index: int) -> str:
+    return f"bench-user-{index}@example.org"
+
+
+def _insert_batches(db: Session, model, rows: Iterable[dict]) -> int:
+    inserted = 0
+    batch: List[dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            db.execute(insert(model), batch)
+            inserted += len(batch)
+            batch = []
+    if batch:
+        db.execute(insert(model), batch)
+        inserted += len(batch)
+    return inserted
+
+
+def reset_database() -> None:
+    Base.metadata.drop_all(bind=engine)
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            conn.exec_driver_sql(f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}")
+
+
+def seed(
+    db: Session,
+    *,
+    users: int,
+    projects: int,
+    events: int,
+    applications: int,
+    volunteers: int,
+    notifications: int,
+    seed: int = 42,
+) -> dict:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    hashed_password = hash_pwd(BENCH_PASSWORD)
+    applications = min(applications, max(users - 1, 0))
+    volunteers = min(volunteers, applications)
+
+    def past(days: int = HISTORY_DAYS) -> datetime:
+        return now - timedelta(seconds=rng.randint(0, days * 86400))
+
+    people = []
+    for index in range(users):
+        created_at = past()
+        people.append({
+            "id": str(uuid7(int(created_at.timestamp() * 1000))),
+            "name": f"Bench User {index}",
+            "email": bench_email(index),
+            "phonenumber": f"+1555{index:07d}",
+            "hashed_password": hashed_password,
+            "city": rng.choice(CITIES),
+            "skills": rng.sample(SKILLS, rng.randint(1, 4)),
+            "interests": rng.sample(CATEGORIES, rng.randint(0, 2)),
+            "created_at": created_at,
+        })
+    counts = {"users": _insert_batches(db, Users, people)}
+
+    owners = people[: max(1, users // 10)]
+    project_rows = []
+    for index in range(projects):
+        owner = rng.choice(owners)
+        start = (now + timedelta(days=rng.randint(-90, 90))).date()
+        category = rng.choice(CATEGORIES)
+        topic = rng.choice(TOPICS)
+        project_rows.append({
+            "id": str(uuid.uuid4()),
+            "owner_id": owner["id"],
+            "title": f"{category} {topic} #{index}",
+            "short_description": f"A {topic} for women and girls in the community.",
+            "detailed_description": f"We are organising a {topic} focused on {category.lower()}. " * 8,
+            "category": category,
+            "project_type": rng.choice(list(ProjectType)),
+            "location": rng.choice(CITIES),
+            "image_url": "/volunteer-project.jpg",
+            "skills_needed": rng.sample(SKILLS, rng.randint(1, 3)),
+            "start_date": start,
+            "end_date": start + timedelta(days=rng.randint(1, 180)),
+            "created_at": past(),
+        })
+    counts["projects"] = _insert_batches(db, Project, project_rows)
+
+    def event_rows():
+        for project in project_rows:
+            for index in range(events):
+                yield {
+                    "id": str(uuid.uuid4()),
+                    "project_id": project["id"],
+                    "name": f"Session {index + 1}",
+                    "description": "Hands-on session",
+                    "date": project["start_date"] + timedelta(days=7 * index),
+                    "time": f"{rng.randint(8, 18):02d}:00",
+                    "slots_available": rng.randint(5, 50),
+                }
+
+    counts["events"] = _insert_batches(db, ProjectEvent, event_rows())
+
+    joined: List[dict] = []
+
+    def application_rows():
+        for project in project_rows:
+            candidates = rng.sample(people, min(applications + 1, users))
+            applicants = [person for person in candidates if person["id"] != project["owner_id"]][:applications]
+            for index, person in enumerate(applicants):
+                if index < volunteers:
+                    status = ApplicationStatus.ACCEPTED
+                    joined.append({"project_id": project["id"], "volunteer_id": person["id"]})
+                else:
+                    status = rng.choice([ApplicationStatus.PENDING, ApplicationStatus.PENDING, ApplicationStatus.REJECTED])
+                yield {
+                    "id": str(uuid.uuid4()),
+                    "project_id": project["id"],
+                    "volunteer_id": person["id"],
+                    "volunteer_name": person["name"],
+                    "volunteer_email": person["email"],
+                    "volunteer_phone": person["phonenumber"],
+                    "skills": person["skills"],
+                    "message": "I would love to help.",
+                    "status": status,
+                    "applied_at": past(),
+                }
+
+    counts["applications"] = _insert_batches(db, ProjectApplication, application_rows())
+    counts["volunteers"] = _insert_batches(
+        db,
+        ProjectVolunteer,
+        (
+            {
+                "id": str(uuid.uuid4()),
+                "role": None,
+                "status": VolunteerStatus.ACTIVE,
+                "joined_at": past(),
+                "hours_contributed": rng.choice([None, rng.randint(1, 40)]),
+                **row,
+            }
+            for row in joined
+        ),
+    )
+
+    def notification_rows():
+        for person in people:
+            for _ in range(notifications):
+                project = rng.choice(project_rows) if project_rows else None
+                yield {
+                    "id": str(uuid.uuid4()),
+                    "user_id": person["id"],
+                    "project_id": project["id"] if project else None,
+                    "type": NotificationType.PROJECT_MATCH,
+                    "title": "New project matches your profile",
+                    "message": "A project is looking for volunteers with your skills.",
+                    "project_title": project["title"] if project else None,
+                    "read": rng.random() < 0.5,
+                    "created_at": past(30),
+                }
+
+    counts["notifications"] = _insert_batches(db, Notification, notification_rows())
+    db.commit()
+
+    # Derived tables are rebuilt the same way an operator would after a restore.
+    counts.update(rebuild_skill_indexes(db))
+    counts["rollup_rows"] = rebuild_rollups(db)
+    counts["unread_counters"] = rebuild_unread_counts(db)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed the database with a synthetic benchmark dataset.")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("--events", type=int, default=3, help="events per project")
+    parser.add_argument("--applications", type=int, default=20, help="applications per project")
+    parser.add_argument("--volunteers", type=int, default=5, help="accepted applicants per project")
+    parser.add_argument("--notifications", type=int, default=5, help="notifications per user")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="drop every table first")
+    args = parser.parse_args()
+
+    from main import ensure_schema
+
+    if args.reset:
+        reset_database()
+    ensure_schema()
+    started = time.perf_counter()
+    session = SessionLocal()
+    try:
+        counts = seed(
+            session,
+            users=args.users,
+            projects=args.projects,
+            events=args.events,
+            applications=args.applications,
+            volunteers=args.volunteers,
+            notifications=args.notifications,
+            seed=args.seed,
+        )
+    finally:
+        session.close()
+    summary = ", ".join(f"{count} {name}" for name, count in counts.items())
+    print(f"Seeded {summary} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# Fires concurrent signups at POST /create/user and checks the user ID allocator
+# under contention.
+#
+#     python benchmarks/signup_check.py [--signups 100] [--rounds 2] [--database-url URL]
+#
+# Each round sends every signup at once through the in-process app and checks that:
+#   - every response is 200;
+#   - every returned ID is a distinct UUIDv7;
+#   - the users table grew by exactly the number of signups.
+# By default it runs against a throwaway SQLite file seeded with a few existing
+# users. --database-url points it at another database; that database is DROPPED
+# and re-seeded. Exits non-zero if any check fails.
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import List
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Check that parallel signups get distinct user IDs.")
+    parser.add_argument("--signups", type=int, default=100, help="concurrent signups per round")
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--database-url", help="database to reset and seed (default: a temporary SQLite file)")
+    return parser.parse_args()
+
+
+def is_uuid7(value: str) -> bool:
+    try:
+        return uuid.UUID(value).version == 7
+    except (TypeError, ValueError):
+        return False
+
+
+async def run(args) -> List[str]:
+    # Imported only now: database.py builds its engines from DATABASE_URL at import time.
+    import httpx
+    from sqlalchemy import func, select
+
+    import main
+    from database import SessionLocal, async_engine
+    from models import Users
+    from seed import BENCH_PASSWORD, reset_database, seed
+
+    def user_count() -> int:
+        db = SessionLocal()
+        try:
+            return db.scalar(select(func.count()).select_from(Users))
+        finally:
+            db.close()
+
+    reset_database()
+    main.ensure_schema()
+    db = SessionLocal()
+    try:
+        seed(db, users=20, projects=0, events=0, applications=0, volunteers=0, notifications=0)
+    finally:
+        db.close()
+
+    problems = []
+    seen = set()
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://signup", timeout=120) as client:
+            for round_number in range(args.rounds):
+                before = user_count()
+                bodies = [
+                    {
+                        "name": f"Signup {round_number}-{n}",
+                        "email": f"signup-{round_number}-{n}@example.org",
+                        "phonenumber": f"+1666{round_number:02d}{n:06d}",
+                        "password": BENCH_PASSWORD,
+                    }
+                    for n in range(args.signups)
+                ]
+                started = time.perf_counter()
+                responses = await asyncio.gather(*(client.post("/create/user", json=body) for body in bodies))
+                elapsed = time.perf_counter() - started
+                after = user_count()
+
+                failed = [response for response in responses if response.status_code != 200]
+                ids = [response.json()["id"] for response in responses if response.status_code == 200]
+                print(f"round {round_number + 1}: {args.signups} signups in {elapsed:.2f}s, {len(failed)} failed, users {before} -> {after}")
+                if failed:
+                    problems.append(f"round {round_number + 1}: {len(failed)} non-200 responses, e.g. {failed[0].status_code} {failed[0].text[:120]}")
+                if len(set(ids)) != len(ids) or seen.intersection(ids):
+                    problems.append(f"round {round_number + 1}: duplicate user IDs issued")
+                if not all(is_uuid7(user_id) for user_id in ids):
+                    problems.append(f"round {round_number + 1}: IDs that are not UUIDv7")
+                if after - before != args.signups:
+                    problems.append(f"round {round_number + 1}: expected {args.signups} new users, found {after - before}")
+                seen.update(ids)
+    finally:
+        await async_engine.dispose()
+    return problems
+
+
+def main() -> None:
+    args = parse_args()
+    with tempfile.TemporaryDirectory(prefix="signup-check-") as workdir:
+        os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{Path(workdir) / 'signup_check.db'}"
+        os.environ["UPLOAD_ROOT"] = str(Path(workdir) / "uploads")
+        os.environ["ASYNC_DATABASE_URL"] = ""
+        # Admit every signup of a round at once; a 503 from the bcrypt pool would
+        # hide what the allocator does under contention.
+        os.environ["PASSWORD_QUEUE_LIMIT"] = str(args.signups)
+        sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+        problems = asyncio.run(run(args))
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    if not problems:
+        print("Signup checks passed")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
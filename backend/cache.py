@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+_MISSING = object()
+
+
+class TTLCache:
+    # Bounded LRU map whose entries also expire `ttl` seconds after being stored.
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = max(1, maxsize)
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+
+class ScopedTTLCache:
+    # TTLCache whose entries belong to a scope (e.g. an owner id). invalidate_scope()
+    # bumps the scope's generation in O(1); stale entries stop matching and age out.
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations: dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, scope: Hashable, key: Hashable) -> tuple:
+        with self._lock:
+            return (scope, self._generations.get(scope, 0), key)
+
+    def get_or_compute(self, scope: Hashable, key: Hashable, compute: Callable[[], Any]) -> Any:
+        # The generation is read before computing, so a result that raced with an
+        # invalidation is stored under the old generation and never served.
+        full_key = self._key(scope, key)
+        value = self._entries.get(full_key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self._entries.set(full_key, value)
+        return value
+
+    def invalidate_scope(self, scope: Hashable) -> None:
+        with self._lock:
+            self._generations[scope] = self._generations.get(scope, 0) + 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return self._entries.stats()
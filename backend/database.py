@@ -1,4 +1,10 @@
-from sqlalchemy import create_engine
+import logging
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
@@ -7,6 +13,8 @@ import os
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 DATABASE_URL = os.getenv("DATABASE_URL")
 engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -14,3 +22,98 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+
+def _async_database_url(url: str) -> str:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"No asyncio driver configured for '{backend}'; set ASYNC_DATABASE_URL explicitly.")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_database_url(DATABASE_URL)
+async_engine = create_async_engine(ASYNC_DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Pooled connections held while handling the current request; set by the request middleware.
+class RequestCheckouts:
+    __slots__ = ("checkouts", "held", "peak")
+
+    def __init__(self):
+        self.checkouts = 0
+        self.held = 0
+        self.peak = 0
+
+
+_request_checkouts: ContextVar[Optional[RequestCheckouts]] = ContextVar("request_checkouts", default=None)
+pool_checkout_stats = {"checkouts": 0, "requests": 0, "multi_connection_requests": 0}
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    pool_checkout_stats["checkouts"] += 1
+    tracker = _request_checkouts.get()
+    if tracker is not None:
+        tracker.checkouts += 1
+        tracker.held += 1
+        tracker.peak = max(tracker.peak, tracker.held)
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    tracker = _request_checkouts.get()
+    if tracker is not None and tracker.held > 0:
+        tracker.held -= 1
+
+
+for _engine in (engine, async_engine.sync_engine):
+    event.listen(_engine, "checkout", _on_checkout)
+    event.listen(_engine, "checkin", _on_checkin)
+
+
+def _end_request_checkouts(tracker: RequestCheckouts) -> None:
+    pool_checkout_stats["requests"] += 1
+    if tracker.peak > 1:
+        pool_checkout_stats["multi_connection_requests"] += 1
+
+
+class ConnectionCheckoutMiddleware:
+    # Plain ASGI middleware, like metrics.MetricsMiddleware, so the tracker spans the
+    # whole response and requests that raise are still counted. get_db / get_async_db
+    # are shared by auth and handlers, so a request should never hold more than one
+    # pooled connection at a time.
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        tracker = RequestCheckouts()
+        token = _request_checkouts.set(tracker)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_checkouts.reset(token)
+            _end_request_checkouts(tracker)
+            if tracker.peak > 1:
+                logger.warning("%s %s held %d DB connections at once", scope["method"], scope["path"], tracker.peak)
@@ -0,0 +1,119 @@
+import csv
+import io
+from datetime import datetime
+from enum import Enum
+from typing import Iterator, Sequence
+
+from sqlalchemy import Select, select
+
+from database import SessionLocal
+from models import ProjectApplication, ProjectVolunteer, Users
+from serialization import dumps
+
+# Rows fetched per round trip; also the number of rows encoded into each chunk.
+EXPORT_BATCH_SIZE = 1000
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+APPLICATION_EXPORT_COLUMNS = (
+    "id",
+    "project_id",
+    "volunteer_id",
+    "volunteer_name",
+    "volunteer_email",
+    "volunteer_phone",
+    "skills",
+    "message",
+    "status",
+    "applied_at",
+    "updated_at",
+)
+VOLUNTEER_EXPORT_COLUMNS = (
+    "id",
+    "project_id",
+    "volunteer_id",
+    "name",
+    "email",
+    "skills",
+    "role",
+    "hours_contributed",
+    "status",
+    "joined_at",
+)
+
+
+def application_export_query(project_id: str) -> Select:
+    return (
+        select(*(ProjectApplication.__table__.c[column] for column in APPLICATION_EXPORT_COLUMNS))
+        .where(ProjectApplication.project_id == project_id)
+        .order_by(ProjectApplication.applied_at, ProjectApplication.id)
+    )
+
+
+def volunteer_export_query(project_id: str) -> Select:
+    return (
+        select(
+            ProjectVolunteer.id,
+            ProjectVolunteer.project_id,
+            ProjectVolunteer.volunteer_id,
+            Users.name,
+            Users.email,
+            Users.skills,
+            ProjectVolunteer.role,
+            ProjectVolunteer.hours_contributed,
+            ProjectVolunteer.status,
+            ProjectVolunteer.joined_at,
+        )
+        .outerjoin(Users, Users.id == ProjectVolunteer.volunteer_id)
+        .where(ProjectVolunteer.project_id == project_id)
+        .order_by(ProjectVolunteer.joined_at, ProjectVolunteer.id)
+    )
+
+
+def _csv_cell(value):
+    # Lists use the same ";" separator the CSV project import accepts.
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return ";".join(str(item) for item in value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _record(row, columns: Sequence[str]) -> dict:
+    record = dict(zip(columns, row))
+    if record.get("skills") is None:
+        record["skills"] = []
+    for key, value in record.items():
+        if isinstance(value, Enum):
+            record[key] = value.value
+    return record
+
+
+def _encode(rows, columns: Sequence[str], fmt: str) -> bytes:
+    if fmt == "ndjson":
+        return b"".join(dumps(_record(row, columns)) + b"\n" for row in rows)
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_csv_cell(value) for value in row] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def stream_export(query: Select, columns: Sequence[str], fmt: str) -> Iterator[bytes]:
+    # Runs inside the StreamingResponse, after the request's session is gone,
+    # so it owns a session for as long as the download lasts. yield_per streams
+    # through a server-side cursor where the driver supports one, so memory use
+    # is bounded by EXPORT_BATCH_SIZE rather than the size of the export.
+    db = SessionLocal()
+    try:
+        if fmt == "csv":
+            yield _encode([columns], columns, fmt)
+        result = db.execute(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for rows in result.partitions():
+            yield _encode(rows, columns, fmt)
+    finally:
+        db.close()
@@ -0,0 +1,41 @@
+from typing import Dict
+
+from sqlalchemy import exists, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import ImageVariantSet, Project
+from versions import PROJECTS_KEY, bump_versions
+
+
+def _upsert_variants(db: Session, image_url: str, variants: Dict[str, str]) -> None:
+    table = ImageVariantSet.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = dialect_insert(table).values(image_url=image_url, variants=variants)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.image_url],
+            set_={"variants": variants, "rendered_at": func.now()},
+        )
+        db.execute(stmt)
+        return
+
+    updated = db.execute(update(table).where(table.c.image_url == image_url).values(variants=variants))
+    if updated.rowcount == 0:
+        db.execute(insert(table).values(image_url=image_url, variants=variants))
+
+
+def record_image_variants(image_url: str, variants: Dict[str, str]) -> None:
+    # Runs once an upload's variants are on disk (images.schedule_variants). Uploads
+    # usually finish rendering before any project points at them; only when one
+    # already does has a /projects response changed, so only then is the ETag bumped.
+    db = SessionLocal()
+    try:
+        _upsert_variants(db, image_url, variants)
+        if db.scalar(select(exists().where(Project.image_url == image_url))):
+            bump_versions(db, [PROJECTS_KEY])
+        db.commit()
+    finally:
+        db.close()
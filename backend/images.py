@@ -0,0 +1,132 @@
+import logging
+import multiprocessing
+import os
+import re
+import sys
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Defaults to backend/uploads; the benchmark harnesses point it at a temporary directory.
+UPLOAD_ROOT = Path(os.getenv("UPLOAD_ROOT") or Path(__file__).resolve().parent / "uploads")
+PROJECT_IMAGE_DIR = UPLOAD_ROOT / "project_images"
+PROJECT_IMAGE_URL_PREFIX = "/uploads/project_images/"
+VARIANT_DIR = PROJECT_IMAGE_DIR / "variants"
+VARIANT_URL_PREFIX = f"{PROJECT_IMAGE_URL_PREFIX}variants/"
+PROJECT_IMAGE_DIR.mkdir(parents=True, exist_ok=True)
+VARIANT_DIR.mkdir(exist_ok=True)
+
+# Longest edge in pixels; originals smaller than this are re-encoded, never upscaled.
+VARIANT_SIZES = {"thumb": 320, "card": 640, "large": 1280}
+VARIANT_FORMATS = {"webp": ("WEBP", {"quality": 80, "method": 4}), "avif": ("AVIF", {"quality": 55})}
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", str(min(2, os.cpu_count() or 1))))
+
+# Names given by upload_project_image: a sha256 digest, or a uuid4 hex for older uploads.
+# Either way a name never points at different content, so variants keyed on it stay valid.
+_UPLOAD_NAME = re.compile(r"^([0-9a-f]{64}|[0-9a-f]{32})\.(jpg|png|gif|webp)$")
+
+# Called in the server process with (image_url, variants) once an upload's variants exist.
+VariantsRendered = Callable[[str, Dict[str, str]], None]
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _variant_name(key: str, size: str, fmt: str) -> str:
+    return f"{key}-{size}.{fmt}"
+
+
+def render_variants(source: str) -> Dict[str, str]:
+    # Runs in a worker process. Writes each missing variant through a temporary file
+    # so readers never see a partial image. Returns the URLs of every variant the
+    # upload now has, keyed "<size>_<format>".
+    from PIL import Image, ImageOps, features
+
+    source_path = Path(source)
+    key = _UPLOAD_NAME.match(source_path.name).group(1)
+    formats = {fmt: spec for fmt, spec in VARIANT_FORMATS.items() if features.check(fmt)}
+    variants = {}
+    with Image.open(source_path) as original:
+        original.seek(0)
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info or "A" in image.mode else "RGB")
+        for size, edge in VARIANT_SIZES.items():
+            resized = None
+            for fmt, (pil_format, options) in formats.items():
+                name = _variant_name(key, size, fmt)
+                target = VARIANT_DIR / name
+                if not target.exists():
+                    if resized is None:
+                        resized = image.copy()
+                        resized.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+                    temp = target.with_name(f".{target.name}.{os.getpid()}")
+                    resized.save(temp, format=pil_format, **options)
+                    os.replace(temp, target)
+                variants[f"{size}_{fmt}"] = f"{VARIANT_URL_PREFIX}{name}"
+    return variants
+
+
+def _image_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: forking a process that is running threads can deadlock the child.
+        _pool = ProcessPoolExecutor(max_workers=max(1, IMAGE_WORKERS), mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def _report(future: Future, image_url: str, on_rendered: VariantsRendered) -> None:
+    if future.cancelled():
+        return
+    if future.exception() is not None:
+        logger.error("Image variant generation failed: %s", future.exception())
+        return
+    try:
+        on_rendered(image_url, future.result())
+    except Exception:
+        logger.exception("Recording image variants for %s failed", image_url)
+
+
+def schedule_variants(filename: str, on_rendered: VariantsRendered) -> Optional[Future]:
+    # Fire-and-forget: the upload response does not wait for the variants. on_rendered
+    # runs in the pool's callback thread once the files are in place.
+    if not _UPLOAD_NAME.match(filename):
+        return None
+    future = _image_pool().submit(render_variants, str(PROJECT_IMAGE_DIR / filename))
+    future.add_done_callback(lambda done: _report(done, f"{PROJECT_IMAGE_URL_PREFIX}{filename}", on_rendered))
+    return future
+
+
+def shutdown_image_pool(wait: bool = False) -> None:
+    # Queued renders are dropped; wait=True blocks until running ones finish.
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=wait, cancel_futures=True)
+        _pool = None
+
+
+def backfill_variants(on_rendered: VariantsRendered) -> int:
+    names = sorted(path.name for path in PROJECT_IMAGE_DIR.iterdir() if _UPLOAD_NAME.match(path.name))
+    pool = _image_pool()
+    futures = {name: pool.submit(render_variants, str(PROJECT_IMAGE_DIR / name)) for name in names}
+    recorded = 0
+    try:
+        for name, future in futures.items():
+            try:
+                on_rendered(f"{PROJECT_IMAGE_URL_PREFIX}{name}", future.result())
+                recorded += 1
+            except Exception as exc:
+                print(f"Skipped {name}: {exc}", file=sys.stderr)
+    finally:
+        shutdown_image_pool()
+    return recorded
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["backfill"]:
+        sys.exit("usage: python images.py backfill")
+    # Imported here, not at the top: worker processes import this module and never touch the database.
+    from image_variants import record_image_variants
+
+    print(f"Rendered and recorded variants for {backfill_variants(record_image_variants)} images")
@@ -0,0 +1,54 @@
+from typing import Dict, Iterable, Optional, Set
+
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from database import get_db
+from models import Users
+
+# Keeps each IN (...) list well below SQLite's bound-parameter limit.
+LOADER_BATCH_SIZE = 500
+
+
+class UserLoader:
+    # Request-scoped batch loader: queue user IDs with prime(), then load()/load_many()
+    # resolve every pending ID with one IN (...) query and memoize the result.
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._loaded: Dict[str, Optional[Users]] = {}
+        self._pending: Set[str] = set()
+
+    def prime(self, user_ids: Iterable[Optional[str]]) -> None:
+        for user_id in user_ids:
+            if user_id is not None and user_id not in self._loaded:
+                self._pending.add(user_id)
+
+    def _dispatch(self) -> None:
+        pending = list(self._pending)
+        self._pending.clear()
+        for start in range(0, len(pending), LOADER_BATCH_SIZE):
+            batch = pending[start:start + LOADER_BATCH_SIZE]
+            found = {user.id: user for user in self.db.scalars(select(Users).where(Users.id.in_(batch)))}
+            for user_id in batch:
+                self._loaded[user_id] = found.get(user_id)
+
+    def load(self, user_id: Optional[str]) -> Optional[Users]:
+        if user_id is None:
+            return None
+        self.prime([user_id])
+        if self._pending:
+            self._dispatch()
+        return self._loaded.get(user_id)
+
+    def load_many(self, user_ids: Iterable[Optional[str]]) -> Dict[str, Optional[Users]]:
+        user_ids = [user_id for user_id in user_ids if user_id is not None]
+        self.prime(user_ids)
+        if self._pending:
+            self._dispatch()
+        return {user_id: self._loaded.get(user_id) for user_id in user_ids}
+
+
+def get_user_loader(db: Session = Depends(get_db)) -> UserLoader:
+    return UserLoader(db)
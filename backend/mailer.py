@@ -0,0 +1,200 @@
+import asyncio
+import logging
+import os
+import random
+from email.message import EmailMessage
+from pathlib import Path
+from typing import List, Optional
+
+import aiosmtplib
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_FOLDER = Path(__file__).parent / "templates"
+# Templates compiled once at startup instead of per message.
+PRECOMPILED_TEMPLATES = ("new_application.html",)
+
+MAIL_SERVER = os.getenv("MAIL_SERVER", "smtp.gmail.com")
+MAIL_PORT = int(os.getenv("MAIL_PORT", "587"))
+MAIL_STARTTLS = os.getenv("MAIL_STARTTLS", "true").lower() == "true"
+MAIL_SSL_TLS = os.getenv("MAIL_SSL_TLS", "false").lower() == "true"
+MAIL_TIMEOUT_SECONDS = float(os.getenv("MAIL_TIMEOUT_SECONDS", "30"))
+# Each worker keeps one SMTP session open, so this is also the connection pool size.
+MAIL_WORKERS = int(os.getenv("MAIL_WORKERS", "2"))
+MAIL_QUEUE_LIMIT = int(os.getenv("MAIL_QUEUE_LIMIT", "1000"))
+MAIL_BATCH_SIZE = int(os.getenv("MAIL_BATCH_SIZE", "20"))
+MAIL_MAX_ATTEMPTS = int(os.getenv("MAIL_MAX_ATTEMPTS", "5"))
+MAIL_RETRY_BASE_SECONDS = float(os.getenv("MAIL_RETRY_BASE_SECONDS", "1"))
+MAIL_RETRY_MAX_SECONDS = float(os.getenv("MAIL_RETRY_MAX_SECONDS", "60"))
+# Sessions idle for longer than this are closed rather than left for the server to drop.
+MAIL_IDLE_SECONDS = float(os.getenv("MAIL_IDLE_SECONDS", "60"))
+
+
+class _Outgoing:
+    __slots__ = ("message", "attempts")
+
+    def __init__(self, message: EmailMessage):
+        self.message = message
+        self.attempts = 0
+
+
+class MailDispatcher:
+    # Outbound mail queue: handlers enqueue() from any thread and return immediately;
+    # worker tasks drain the queue in batches over long-lived SMTP sessions and
+    # re-queue failed messages with exponential backoff.
+
+    def __init__(self):
+        self.sender = os.getenv("MAIL_FROM")
+        self.username = os.getenv("MAIL_UNAME")
+        self.password = os.getenv("MAIL_PASSWORD")
+        self.templates = Environment(
+            loader=FileSystemLoader(TEMPLATE_FOLDER),
+            autoescape=select_autoescape(["html"]),
+        )
+        self._compiled = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self.stats = {"queued": 0, "sent": 0, "retried": 0, "failed": 0, "dropped": 0}
+
+    def render(self, template_name: str, context: dict) -> str:
+        template = self._compiled.get(template_name)
+        if template is None:
+            template = self._compiled[template_name] = self.templates.get_template(template_name)
+        return template.render(**context)
+
+    def build_message(self, subject: str, recipients: List[str], template_name: str, context: dict) -> EmailMessage:
+        message = EmailMessage()
+        message["Subject"] = subject
+        message["From"] = self.sender
+        message["To"] = ", ".join(recipients)
+        message.set_content(self.render(template_name, context), subtype="html")
+        return message
+
+    async def start(self) -> None:
+        for template_name in PRECOMPILED_TEMPLATES:
+            self._compiled[template_name] = self.templates.get_template(template_name)
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=MAIL_QUEUE_LIMIT)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(max(1, MAIL_WORKERS))]
+
+    async def stop(self, timeout: float = 10) -> None:
+        if self._queue is None:
+            return
+        try:
+            # Give queued mail a chance to go out before the workers are torn down.
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Shutting down with %d unsent emails", self._queue.qsize())
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        self._loop = None
+
+    def enqueue(self, message: EmailMessage) -> None:
+        # Safe to call from sync handlers running in the threadpool.
+        if self._loop is None:
+            logger.warning("Mail dispatcher is not running; dropping email to %s", message["To"])
+            self.stats["dropped"] += 1
+            return
+        self._loop.call_soon_threadsafe(self._put, _Outgoing(message))
+
+    def _put(self, item: _Outgoing) -> None:
+        if self._queue is None:
+            self.stats["dropped"] += 1
+            return
+        try:
+            self._queue.put_nowait(item)
+            if item.attempts == 0:
+                self.stats["queued"] += 1
+        except asyncio.QueueFull:
+            logger.error("Mail queue full; dropping email to %s", item.message["To"])
+            self.stats["dropped"] += 1
+
+    def _connection(self) -> aiosmtplib.SMTP:
+        return aiosmtplib.SMTP(
+            hostname=MAIL_SERVER,
+            port=MAIL_PORT,
+            username=self.username or None,
+            password=self.password or None,
+            use_tls=MAIL_SSL_TLS,
+            start_tls=MAIL_STARTTLS,
+            timeout=MAIL_TIMEOUT_SECONDS,
+        )
+
+    async def _next_batch(self, smtp: aiosmtplib.SMTP) -> List[_Outgoing]:
+        try:
+            first = await asyncio.wait_for(self._queue.get(), MAIL_IDLE_SECONDS)
+        except asyncio.TimeoutError:
+            if smtp.is_connected:
+                await _close(smtp)
+            first = await self._queue.get()
+        batch = [first]
+        while len(batch) < MAIL_BATCH_SIZE and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _worker(self) -> None:
+        smtp = self._connection()
+        try:
+            while True:
+                batch = await self._next_batch(smtp)
+                for item in batch:
+                    try:
+                        await self._send(smtp, item.message)
+                        self.stats["sent"] += 1
+                    except (aiosmtplib.SMTPException, OSError) as exc:
+                        await _close(smtp)
+                        self._retry_later(item, exc)
+                    except Exception:
+                        # The message itself is unsendable (e.g. no recipients); retrying
+                        # cannot help, and letting it escape would kill this worker.
+                        logger.exception("Dropping unsendable email to %s", item.message["To"])
+                        self.stats["failed"] += 1
+                    finally:
+                        self._queue.task_done()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await _close(smtp)
+
+    async def _send(self, smtp: aiosmtplib.SMTP, message: EmailMessage) -> None:
+        if not smtp.is_connected:
+            await smtp.connect()
+            await smtp.send_message(message)
+            return
+        try:
+            await smtp.send_message(message)
+        except aiosmtplib.SMTPServerDisconnected:
+            # The server dropped a pooled session; reconnect once before backing off.
+            smtp.close()
+            await smtp.connect()
+            await smtp.send_message(message)
+
+    def _retry_later(self, item: _Outgoing, exc: Exception) -> None:
+        item.attempts += 1
+        if item.attempts >= MAIL_MAX_ATTEMPTS:
+            logger.error("Giving up on email to %s after %d attempts: %s", item.message["To"], item.attempts, exc)
+            self.stats["failed"] += 1
+            return
+        delay = min(MAIL_RETRY_MAX_SECONDS, MAIL_RETRY_BASE_SECONDS * 2 ** (item.attempts - 1))
+        delay *= random.uniform(0.5, 1.0)
+        logger.warning("Email to %s failed (%s); retrying in %.1fs", item.message["To"], exc, delay)
+        self.stats["retried"] += 1
+        # Retries still pending at shutdown are dropped along with the queue.
+        self._loop.call_later(delay, self._put, item)
+
+
+async def _close(smtp: aiosmtplib.SMTP) -> None:
+    if not smtp.is_connected:
+        return
+    try:
+        await smtp.quit()
+    except (aiosmtplib.SMTPException, OSError):
+        smtp.close()
+
+
+mail_dispatcher = MailDispatcher()
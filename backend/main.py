@@ -1,35 +1,96 @@
+import asyncio
+import base64
+import binascii
 import os
-import random
+import secrets
 import uuid
-from collections import Counter, defaultdict
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import List
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
-from fastapi import Depends, FastAPI, File, HTTPException, Query, UploadFile, status, BackgroundTasks
+from typing import List, Optional
+from fastapi import Depends, FastAPI, File, HTTPException, Query, Request, Response, UploadFile, status, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from sqlalchemy import func
-from sqlalchemy.orm import Session, selectinload
-
-from auth import authenticate_user, create_access_token, get_current_user
-from database import Base, SessionLocal, engine
+from sqlalchemy import and_, case, false, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from cache import ScopedTTLCache
+from auth import (
+    authenticate_user,
+    create_access_token,
+    get_current_user,
+    get_admin_user,
+    get_current_user_async,
+    invalidate_cached_user,
+    user_cache,
+)
+from exports import (
+    APPLICATION_EXPORT_COLUMNS,
+    EXPORT_MEDIA_TYPES,
+    VOLUNTEER_EXPORT_COLUMNS,
+    application_export_query,
+    stream_export,
+    volunteer_export_query,
+)
+from database import (
+    Base,
+    ConnectionCheckoutMiddleware,
+    async_engine,
+    engine,
+    get_async_db,
+    get_db,
+    pool_checkout_stats,
+)
 from models import Project as ProjectModel
 from models import ProjectEvent as ProjectEventModel
+from models import ProjectSkill as ProjectSkillModel
 from models import ProjectType, Users
 from models import ProjectApplication as ProjectApplicationModel
 from models import ApplicationStatus
 from models import ProjectVolunteer as ProjectVolunteerModel
 from models import VolunteerStatus
+from models import Notification as NotificationModel
+from images import PROJECT_IMAGE_DIR, UPLOAD_ROOT, schedule_variants, shutdown_image_pool
+from image_variants import record_image_variants
+from loaders import UserLoader, get_user_loader
+from mailer import mail_dispatcher
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, METRICS_TOKEN, MetricsMiddleware, instrument_engine, metrics_registry
+from notification_counts import ensure_unread_counts, record_notifications_read, unread_count
+from notifications import notification_broker
+from project_import import IMPORT_FORMATS, detect_import_format, import_projects, iter_records
+from matching import ensure_skill_indexes, normalize_skill, notify_project_matches, sync_project_skills, sync_user_skills
+from rollups import (
+    ensure_rollups,
+    record_application,
+    record_projects_created,
+    record_volunteer_joined,
+    rollup_monthly_hours,
+    rollup_summary,
+    rollup_totals,
+)
+from search import ensure_search_index, project_search_filter, search_project_ids
+from slow_queries import install_slow_query_log, slow_query_log
+from streaming_upload import ReceivedFile, UploadTooLarge, receive_file
+from serialization import fast_json_response, project_list
+from versions import PROJECTS_KEY, applications_key, bump_versions, not_modified, resource_etag, volunteers_key
 from schemas import (
     Project as ProjectSchema,
     ProjectCreate,
+    ProjectImportResult,
     ProjectApplication as ProjectApplicationSchema,
     ProjectApplicationCreate,
     ProjectApplicationApply,
     ProjectApplicationStatusUpdate,
+    ProjectTypeEnum,
     ProjectVolunteer as ProjectVolunteerSchema,
     VolunteerStatusEnum,
+    Notification as NotificationSchema,
+    NotificationMarkRead,
+    NotificationReadResult,
+    NotificationUnreadCount,
+    SlowQuery as SlowQuerySchema,
     Token,
     User,
     UserCreate,
@@ -40,13 +101,9 @@ from schemas import (
     AnalyticsSkillMetric,
     AnalyticsMonthlyHoursPoint,
     AnalyticsApplicationStats,
+    AnalyticsDashboard,
 )
-from utils import hash_pwd
-
-BASE_DIR = Path(__file__).resolve().parent
-UPLOAD_ROOT = BASE_DIR / "uploads"
-PROJECT_IMAGE_DIR = UPLOAD_ROOT / "project_images"
-PROJECT_IMAGE_DIR.mkdir(parents=True, exist_ok=True)
+from utils import PasswordPoolSaturated, hash_pwd_async, new_user_id, password_pool_stats
 
 DEFAULT_PROJECT_IMAGE_URL = "/volunteer-project.jpg"
 
@@ -69,16 +126,15 @@ CONTENT_TYPE_EXTENSION_MAP = {
 ALLOWED_IMAGE_EXTENSIONS = set(CONTENT_TYPE_EXTENSION_MAP.values())
 MAX_IMAGE_SIZE_MB = 5
 MAX_IMAGE_SIZE_BYTES = MAX_IMAGE_SIZE_MB * 1024 * 1024
-mail_conf = ConnectionConfig(
-    MAIL_USERNAME=os.environ.get("MAIL_UNAME"),  
-    MAIL_PASSWORD = os.environ.get("MAIL_PASSWORD"),
-    MAIL_FROM = os.environ.get("MAIL_FROM"),
-    MAIL_SERVER = "smtp.gmail.com",
-    MAIL_PORT = 587,
-    MAIL_STARTTLS = True,
-    MAIL_SSL_TLS = False,
-    TEMPLATE_FOLDER = Path(__file__).parent / 'templates',
-)
+ANALYTICS_CACHE_TTL_SECONDS = float(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "60"))
+ANALYTICS_CACHE_MAX_SIZE = int(os.getenv("ANALYTICS_CACHE_MAX_SIZE", "2048"))
+DEFAULT_PROJECTS_PAGE_SIZE = 50
+MAX_PROJECTS_PAGE_SIZE = 200
+MAX_SEARCH_RESULTS = 100
+DEFAULT_NOTIFICATIONS_PAGE_SIZE = 20
+MAX_NOTIFICATIONS_PAGE_SIZE = 100
+NOTIFICATION_STREAM_HEARTBEAT_SECONDS = 15
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
 
 def _validate_root_relative_path(path: str) -> str:
     parts = path.split("/")
@@ -99,20 +155,49 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
+app.add_middleware(ConnectionCheckoutMiddleware)
+app.add_middleware(MetricsMiddleware)
+for _engine in (engine, async_engine.sync_engine):
+    instrument_engine(_engine)
+    install_slow_query_log(_engine)
+
 app.mount("/uploads", StaticFiles(directory=UPLOAD_ROOT), name="uploads")
 
-@app.on_event("startup")
-async def startup():
+
+def ensure_schema():
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist, so indexes added to existing
+    # tables later on have to be created explicitly.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    ensure_search_index(engine)
+    ensure_skill_indexes(engine)
+    ensure_rollups(engine)
+    ensure_unread_counts(engine)
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db 
-    finally:
-        db.close()
+
+@app.on_event("startup")
+async def startup():
+    ensure_schema()
+    await mail_dispatcher.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await mail_dispatcher.stop()
+    shutdown_image_pool()
+    await async_engine.dispose()
+
+@app.exception_handler(PasswordPoolSaturated)
+async def password_pool_saturated_handler(request, exc):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please try again shortly."},
+        headers={"Retry-After": "1"},
+    )
 
 
 def _get_date_threshold(days: int) -> datetime:
@@ -120,31 +205,18 @@ def _get_date_threshold(days: int) -> datetime:
     return datetime.now(timezone.utc) - timedelta(days=clamped_days)
 
 
-def _normalize_to_utc(dt: datetime | None) -> datetime | None:
-    if dt is None:
-        return None
-    if dt.tzinfo is None:
-        return dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc)
-
-
-def generate_user_id(db: Session) -> str:
-    for _ in range(1000):
-        candidate = f"{random.randint(0, 999):03}"
-        if not db.query(Users).filter(Users.id == candidate).first():
-            return candidate
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Unable to generate a unique user ID"
-    )
-
+def _resolve_image_extension(filename: str, content_type: str) -> str:
+    content_type = content_type.lower()
+    if content_type not in ALLOWED_IMAGE_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported image type. Allowed types: JPEG, PNG, GIF, WebP.",
+        )
 
-def _resolve_image_extension(file: UploadFile) -> str:
-    candidate = (Path(file.filename or "").suffix or "").lower()
+    candidate = (Path(filename).suffix or "").lower()
     if candidate in ALLOWED_IMAGE_EXTENSIONS:
         return candidate
 
-    content_type = (file.content_type or "").lower()
     mapped = CONTENT_TYPE_EXTENSION_MAP.get(content_type)
     if mapped:
         return mapped
@@ -155,6 +227,29 @@ def _resolve_image_extension(file: UploadFile) -> str:
     )
 
 
+def _image_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Image is too large. Maximum size is {MAX_IMAGE_SIZE_MB}MB.",
+    )
+
+
+def _store_image_upload(upload: ReceivedFile) -> str:
+    # Stores the received file as <sha256><ext>, so re-uploads of the same image
+    # reuse the existing file. A rename, never a second copy.
+    if upload.size == 0:
+        upload.path.unlink(missing_ok=True)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Uploaded image is empty.")
+
+    filename = f"{upload.sha256}{upload.extension}"
+    destination = PROJECT_IMAGE_DIR / filename
+    if destination.exists():
+        upload.path.unlink(missing_ok=True)
+    else:
+        os.replace(upload.path, destination)
+    return filename
+
+
 def _normalize_image_url_for_storage(raw: str) -> str:
     cleaned = raw.strip()
     if not cleaned:
@@ -195,8 +290,8 @@ async def root():
     return {"message": "Hello World"}
 
 @app.post('/login', response_model=Token)
-async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
-    user = authenticate_user(db, user_credentials.email, user_credentials.password)
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    user = await authenticate_user(db, user_credentials.email, user_credentials.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -210,70 +305,102 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     return {"access_token": access_token, "token_type": "bearer"}
 
 @app.get('/users/')
-async def get_users(db: Session = Depends(get_db), current_user: Users = Depends(get_current_user)) -> List[User]:
-    users = db.query(Users).all()
+async def get_users(db: AsyncSession = Depends(get_async_db), current_user: Users = Depends(get_current_user_async)) -> List[User]:
+    users = (await db.scalars(select(Users))).all()
     return users 
 
 @app.get('/me', response_model=User)
-async def get_current_user_info(current_user: Users = Depends(get_current_user)):
+async def get_current_user_info(current_user: Users = Depends(get_current_user_async)):
     return current_user
 
 @app.post('/create/user')
-async def create_user(user: UserCreate, db: Session = Depends(get_db)):
-    existing_user = db.query(Users).filter(Users.email == user.email).first()
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    existing_user = await db.scalar(select(Users).where(Users.email == user.email).limit(1))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
-    
-    hashed_pwd = hash_pwd(user.password)
+    # Hand the connection back while bcrypt runs; under a signup burst the hash can
+    # queue behind others for seconds, and holding it would exhaust the pool.
+    await db.rollback()
+
+    hashed_pwd = await hash_pwd_async(user.password)
     new_user = Users(
-        id=generate_user_id(db),
+        id=new_user_id(),
         name=user.name,
         email=user.email,
         hashed_password = hashed_pwd,
         phonenumber = user.phonenumber
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    return new_user
-
-
-@app.post('/projects/upload-image', status_code=status.HTTP_201_CREATED)
-async def upload_project_image(
-    file: UploadFile = File(...),
-    current_user: Users = Depends(get_current_user),
-):
-    if file.content_type is None or file.content_type.lower() not in ALLOWED_IMAGE_CONTENT_TYPES:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Unsupported image type. Allowed types: JPEG, PNG, GIF, WebP.",
-        )
-
-    file_bytes = await file.read()
-    if not file_bytes:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Uploaded image is empty.")
-    if len(file_bytes) > MAX_IMAGE_SIZE_BYTES:
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent signup claimed the same email or phone number first.
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Image is too large. Maximum size is {MAX_IMAGE_SIZE_MB}MB.",
+            detail="Email or phone number already registered"
         )
+    await db.refresh(new_user)
+    return new_user
 
-    extension = _resolve_image_extension(file)
-    filename = f"{uuid.uuid4().hex}{extension}"
-    file_path = PROJECT_IMAGE_DIR / filename
 
+@app.post(
+    '/projects/upload-image',
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {"file": {"type": "string", "format": "binary"}},
+                        "required": ["file"],
+                    }
+                }
+            },
+        }
+    },
+)
+async def upload_project_image(
+    request: Request,
+    current_user: Users = Depends(get_current_user_async),
+):
+    # The body is read here rather than by a File() parameter, so the size limit is
+    # enforced while it arrives instead of after Starlette has spooled all of it.
     try:
-        with open(file_path, "wb") as buffer:
-            buffer.write(file_bytes)
-    finally:
-        await file.close()
+        upload = await receive_file(
+            request, "file", PROJECT_IMAGE_DIR, MAX_IMAGE_SIZE_BYTES, _resolve_image_extension
+        )
+    except UploadTooLarge:
+        raise _image_too_large()
+    filename = _store_image_upload(upload)
+    schedule_variants(filename, record_image_variants)
 
     relative_url = f"/uploads/project_images/{filename}"
     return {"image_url": relative_url}
 
+def _profile_dependent_keys(db: Session, user_id: str, updated_user: UserUpdate) -> List[str]:
+    # /projects embeds owner contact details; volunteer lists embed name, email and skills.
+    identity_changed = any(
+        value is not None for value in (updated_user.name, updated_user.email, updated_user.phonenumber)
+    )
+    keys = []
+    if identity_changed and db.scalar(select(ProjectModel.id).where(ProjectModel.owner_id == user_id).limit(1)):
+        keys.append(PROJECTS_KEY)
+    if identity_changed or updated_user.skills is not None:
+        keys.extend(
+            volunteers_key(project_id)
+            for project_id in db.scalars(
+                select(ProjectVolunteerModel.project_id).where(ProjectVolunteerModel.volunteer_id == user_id)
+            )
+        )
+    return keys
+
+
 @app.put('/update/user', response_model=User)
 def update_user(updated_user: UserUpdate, db: Session = Depends(get_db), current_user: Users = Depends(get_current_user)):
     user = db.query(Users).filter(Users.id == current_user.id).first()
@@ -298,12 +425,17 @@ def update_user(updated_user: UserUpdate, db: Session = Depends(get_db), current
         user.interests = updated_user.interests
     if updated_user.story is not None:
         user.story = updated_user.story 
+    if updated_user.skills is not None or updated_user.interests is not None:
+        sync_user_skills(db, user)
+    bump_versions(db, _profile_dependent_keys(db, user.id, updated_user))
     db.commit()
+    invalidate_cached_user(current_user.email, user.email)
     db.refresh(user)
     return user
 
 @app.post('/create/project', response_model=ProjectSchema, status_code=status.HTTP_201_CREATED)
 def create_project(
+    background_tasks: BackgroundTasks,
     details: ProjectCreate,
     db: Session = Depends(get_db),
     current_user: Users = Depends(get_current_user),
@@ -344,21 +476,171 @@ def create_project(
         )
 
     db.add(project)
+    sync_project_skills(db, project)
+    record_projects_created(db, [project])
+    bump_versions(db, [PROJECTS_KEY])
     db.commit()
+    analytics_cache.invalidate_scope(current_user.id)
     db.refresh(project)
+    created = ProjectSchema.model_validate(project)
+    # The match task runs after the response, while this request's session would still
+    # hold its connection; release it so the task does not need a second one.
+    db.close()
+    background_tasks.add_task(notify_project_matches, project.id)
+
+    return created
+
+
+def _notify_imported_matches(project_ids: List[str]) -> None:
+    for project_id in project_ids:
+        notify_project_matches(project_id)
+
+
+@app.post('/projects/import', response_model=ProjectImportResult)
+def import_projects_from_file(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    import_format: Optional[str] = Query(
+        None, alias="format", description="jsonl or csv; inferred from the file name or type when omitted"
+    ),
+    notify_matches: bool = Query(False),
+    db: Session = Depends(get_db),
+    current_user: Users = Depends(get_current_user),
+):
+    fmt = (import_format or detect_import_format(file.filename, file.content_type) or "").lower()
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported import format. Upload a .jsonl or .csv file, or pass format=jsonl|csv.",
+        )
+
+    try:
+        result = import_projects(
+            db, current_user.id, iter_records(file.file, fmt), _normalize_image_url_for_storage
+        )
+    finally:
+        file.file.close()
+    if result.project_ids:
+        analytics_cache.invalidate_scope(current_user.id)
+        if notify_matches:
+            # As in create_project: release the connection before the task opens its own.
+            db.close()
+            background_tasks.add_task(_notify_imported_matches, result.project_ids)
+
+    return ProjectImportResult(imported=len(result.project_ids), failed=result.failed, errors=result.errors)
+
+
+def _encode_cursor(row_id: str) -> str:
+    return base64.urlsafe_b64encode(row_id.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> str:
+    try:
+        row_id = base64.b64decode(cursor.encode("ascii"), altchars=b"-_", validate=True).decode("utf-8")
+    except (UnicodeError, ValueError, binascii.Error):
+        row_id = ""
+    if not row_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+    return row_id
+
+
+def _before_cursor(model, cursor: str, *anchor_filters):
+    # Keyset on (created_at, id), newest first. The anchor's created_at is read back from
+    # the row itself so the comparison never depends on how the driver binds datetimes.
+    cursor_id = _decode_cursor(cursor)
+    anchor_created_at = (
+        select(model.created_at).where(model.id == cursor_id, *anchor_filters).scalar_subquery()
+    )
+    return or_(
+        model.created_at < anchor_created_at,
+        and_(model.created_at == anchor_created_at, model.id < cursor_id),
+    )
+
 
-    return project
 @app.get('/projects', response_model=List[ProjectSchema])
-def get_projects(db: Session = Depends(get_db), current_user: Users = Depends(get_current_user)):
+def get_projects(
+    request: Request,
+    response: Response,
+    category: Optional[str] = None,
+    project_type: Optional[ProjectTypeEnum] = None,
+    skill: Optional[List[str]] = Query(None),
+    start_from: Optional[date] = None,
+    start_to: Optional[date] = None,
+    q: Optional[str] = Query(None, max_length=255),
+    owner_id: Optional[str] = Query(None, max_length=36),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PROJECTS_PAGE_SIZE, ge=1, le=MAX_PROJECTS_PAGE_SIZE),
+    db: Session = Depends(get_db),
+    current_user: Users = Depends(get_current_user),
+):
+    cached = not_modified(request, response, resource_etag(db, PROJECTS_KEY, request.url.query))
+    if cached is not None:
+        return cached
+
+    query = db.query(ProjectModel).options(
+        selectinload(ProjectModel.owner), selectinload(ProjectModel.events), joinedload(ProjectModel.variant_set)
+    )
+
+    if owner_id:
+        query = query.filter(ProjectModel.owner_id == owner_id)
+    if category:
+        query = query.filter(ProjectModel.category == category)
+    if project_type is not None:
+        query = query.filter(ProjectModel.project_type == ProjectType(project_type.value))
+    skills = {normalize_skill(name) for name in skill or []} - {""}
+    if skills:
+        query = query.filter(ProjectModel.skill_index.any(ProjectSkillModel.skill.in_(skills)))
+    if start_from is not None:
+        query = query.filter(ProjectModel.start_date >= start_from)
+    if start_to is not None:
+        query = query.filter(ProjectModel.start_date <= start_to)
+    if q and q.strip():
+        query = query.filter(project_search_filter(db, q))
+
+    if cursor:
+        query = query.filter(_before_cursor(ProjectModel, cursor))
+
+    projects = (
+        query.order_by(ProjectModel.created_at.desc(), ProjectModel.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    if len(projects) > limit:
+        projects = projects[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = _encode_cursor(projects[-1].id)
+    # Rows come straight from the ORM, so they skip response_model validation.
+    return fast_json_response(project_list(projects), response)
+
+
+@app.get('/projects/search', response_model=List[ProjectSchema])
+def search_projects(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=255),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_RESULTS),
+    db: Session = Depends(get_db),
+    current_user: Users = Depends(get_current_user),
+):
+    ranked_ids = search_project_ids(db, q, skip=skip, limit=limit)
+    if not ranked_ids:
+        return []
+
     projects = (
         db.query(ProjectModel)
-        .options(selectinload(ProjectModel.owner), selectinload(ProjectModel.events))
+        .options(
+            selectinload(ProjectModel.owner), selectinload(ProjectModel.events), joinedload(ProjectModel.variant_set)
+        )
+        .filter(ProjectModel.id.in_(ranked_ids))
         .all()
     )
-    return projects
+    by_id = {project.id: project for project in projects}
+    return fast_json_response(
+        project_list(by_id[project_id] for project_id in ranked_ids if project_id in by_id), response
+    )
+
+
 @app.post('/projects/{project_id}/apply', response_model=ProjectApplicationSchema, status_code=status.HTTP_201_CREATED)
 def apply_to_project(
-    background_tasks: BackgroundTasks,
     project_id: str,
     details: ProjectApplicationApply,
     db: Session = Depends(get_db),
@@ -394,26 +676,30 @@ def apply_to_project(
         status=ApplicationStatus.PENDING,
     )
     creator_details = db.query(Users.email).join(ProjectModel, Users.id == ProjectModel.owner_id).filter(ProjectModel.id == project_id).first()
-    message = MessageSchema(
-        subject="New Application",
-        recipients=[creator_details.email] if creator_details else None,
-        template_body = {
-            "name":current_user.name,
-            "email" : current_user.email,
-            "phone": current_user.phonenumber,
-            "skills": details.skills,
-            "message": details.message,
-        },
-        subtype = MessageType.html
-    )
-    fm = FastMail(mail_conf)
-    background_tasks.add_task(fm.send_message, message, template_name="new_application.html")
     db.add(application)
+    record_application(db, project.owner_id)
+    bump_versions(db, [applications_key(project_id)])
     db.commit()
+    if creator_details:
+        mail_dispatcher.enqueue(mail_dispatcher.build_message(
+            subject="New Application",
+            recipients=[creator_details.email],
+            template_name="new_application.html",
+            context={
+                "name": current_user.name,
+                "email": current_user.email,
+                "phone": current_user.phonenumber,
+                "skills": details.skills,
+                "message": details.message,
+            },
+        ))
+    analytics_cache.invalidate_scope(project.owner_id)
     db.refresh(application)
     return application
 @app.get('/projects/{project_id}/applications', response_model=List[ProjectApplicationSchema])
 def get_project_applications(
+    request: Request,
+    response: Response,
     project_id: str,
     skip: int = 0,
     limit: int = 100,
@@ -431,7 +717,10 @@ def get_project_applications(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to view applications for this project"
         )
-    
+    cached = not_modified(request, response, resource_etag(db, applications_key(project_id), f"{skip}:{limit}"))
+    if cached is not None:
+        return cached
+
     applications = (
         db.query(ProjectApplicationModel)
         .filter(ProjectApplicationModel.project_id == project_id)
@@ -445,15 +734,21 @@ def get_project_applications(
 
 @app.get('/projects/{project_id}/volunteers', response_model=List[ProjectVolunteerSchema])
 def list_project_volunteers(
+    request: Request,
+    response: Response,
     project_id: str,
     db: Session = Depends(get_db),
     current_user: Users = Depends(get_current_user),
+    user_loader: UserLoader = Depends(get_user_loader),
 ):
     project = db.query(ProjectModel).filter(ProjectModel.id == project_id).first()
     if not project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     if project.owner_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view volunteers")
+    cached = not_modified(request, response, resource_etag(db, volunteers_key(project_id)))
+    if cached is not None:
+        return cached
 
     volunteers = (
         db.query(ProjectVolunteerModel)
@@ -462,9 +757,10 @@ def list_project_volunteers(
     )
 
     # Enrich with user info where available
+    user_loader.prime(v.volunteer_id for v in volunteers)
     result = []
     for v in volunteers:
-        user = db.query(Users).filter(Users.id == v.volunteer_id).first()
+        user = user_loader.load(v.volunteer_id)
         try:
             status_enum = VolunteerStatusEnum[v.status.name] if hasattr(v.status, "name") else VolunteerStatusEnum(v.status)
         except (KeyError, ValueError):
@@ -485,74 +781,301 @@ def list_project_volunteers(
     return result
 
 
+def _owned_project_or_error(db: Session, project_id: str, current_user: Users) -> ProjectModel:
+    project = db.get(ProjectModel, project_id)
+    if not project:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    if project.owner_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to export this project")
+    return project
+
+
+def _export_response(db: Session, project_id: str, name: str, query, columns, fmt: str) -> StreamingResponse:
+    # The stream opens its own session; release this request's connection first.
+    db.close()
+    return StreamingResponse(
+        stream_export(query, columns, fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}-{project_id}.{fmt}"'},
+    )
+
+
+@app.get('/projects/{project_id}/applications/export')
+def export_project_applications(
+    project_id: str,
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    db: Session = Depends(get_db),
+    current_user: Users = Depends(get_current_user),
+):
+    _owned_project_or_error(db, project_id, current_user)
+    return _export_response(
+        db, project_id, "applications", application_export_query(project_id), APPLICATION_EXPORT_COLUMNS, export_format
+    )
+
+
+@app.get('/projects/{project_id}/volunteers/export')
+def export_project_volunteers(
+    project_id: str,
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    db: Session = Depends(get_db),
+    current_user: Users = Depends(get_current_user),
+):
+    _owned_project_or_error(db, project_id, current_user)
+    return _export_response(
+        db, project_id, "volunteers", volunteer_export_query(project_id), VOLUNTEER_EXPORT_COLUMNS, export_format
+    )
+
+
 # -----------------------------
-# Analytics Endpoints
+# Notification Endpoints
 # -----------------------------
 
 
-def _volunteer_within_range(volunteer: ProjectVolunteerModel, *, threshold: datetime) -> bool:
-    threshold_utc = _normalize_to_utc(threshold) or threshold
-    joined_at = _normalize_to_utc(volunteer.joined_at)
-    if joined_at and joined_at >= threshold_utc:
-        return True
-    project = volunteer.project
-    project_created_at = _normalize_to_utc(project.created_at if project else None)
-    if project_created_at and project_created_at >= threshold_utc:
-        return True
-    return False
+@app.get('/notifications', response_model=List[NotificationSchema])
+def get_notifications(
+    response: Response,
+    unread_only: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_NOTIFICATIONS_PAGE_SIZE, ge=1, le=MAX_NOTIFICATIONS_PAGE_SIZE),
+    db: Session = Depends(get_db),
+    current_user: Users = Depends(get_current_user),
+):
+    query = db.query(NotificationModel).filter(NotificationModel.user_id == current_user.id)
+    if unread_only:
+        query = query.filter(NotificationModel.read == false())
+    if cursor:
+        query = query.filter(
+            _before_cursor(NotificationModel, cursor, NotificationModel.user_id == current_user.id)
+        )
+
+    notifications = (
+        query.order_by(NotificationModel.created_at.desc(), NotificationModel.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    if len(notifications) > limit:
+        notifications = notifications[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = _encode_cursor(notifications[-1].id)
+    return notifications
 
 
-@app.get('/analytics/overview', response_model=AnalyticsOverview)
-def get_analytics_overview(
-    days: int = Query(30, ge=1, le=365),
+@app.get('/notifications/unread-count', response_model=NotificationUnreadCount)
+def get_unread_notification_count(
     db: Session = Depends(get_db),
     current_user: Users = Depends(get_current_user),
 ):
-    threshold = _get_date_threshold(days)
-    threshold_date = threshold.date()
+    # One primary-key read of the per-user counter, whatever the unread backlog.
+    return NotificationUnreadCount(unread=unread_count(db, current_user.id))
 
-    project_query = (
-        db.query(ProjectModel)
-        .filter(ProjectModel.owner_id == current_user.id)
-        .filter(ProjectModel.created_at >= threshold)
+
+@app.post('/notifications/read', response_model=NotificationReadResult)
+def mark_notifications_read(
+    payload: NotificationMarkRead,
+    db: Session = Depends(get_db),
+    current_user: Users = Depends(get_current_user),
+):
+    stmt = (
+        update(NotificationModel)
+        .where(NotificationModel.user_id == current_user.id, NotificationModel.read == false())
+        .values(read=True, read_at=datetime.now(timezone.utc))
     )
-    total_projects = project_query.count()
+    if payload.ids is not None:
+        if not payload.ids:
+            return NotificationReadResult(updated=0)
+        stmt = stmt.where(NotificationModel.id.in_(payload.ids))
+    updated = db.execute(stmt.execution_options(synchronize_session=False)).rowcount
+    record_notifications_read(db, current_user.id, updated)
+    db.commit()
+    return NotificationReadResult(updated=updated)
+
 
-    total_events = (
-        db.query(ProjectEventModel)
-        .join(ProjectModel, ProjectEventModel.project_id == ProjectModel.id)
-        .filter(ProjectModel.owner_id == current_user.id)
-        .filter(ProjectEventModel.date >= threshold_date)
-        .count()
+@app.get('/notifications/stream')
+async def stream_notifications(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Users = Depends(get_current_user_async),
+):
+    # The stream outlives the request's session, so give its connection back to the pool now.
+    await db.close()
+    user_id = current_user.id
+
+    async def events():
+        queue = notification_broker.subscribe(user_id)
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), NOTIFICATION_STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+        finally:
+            notification_broker.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
-    volunteer_query = (
-        db.query(ProjectVolunteerModel)
-        .options(selectinload(ProjectVolunteerModel.project))
-        .join(ProjectModel, ProjectVolunteerModel.project_id == ProjectModel.id)
-        .filter(ProjectModel.owner_id == current_user.id)
+
+# -----------------------------
+# Metrics
+# -----------------------------
+
+
+def _connection_pool_stats() -> dict:
+    stats = dict(pool_checkout_stats)
+    for name, pool in (("sync", engine.pool), ("async", async_engine.sync_engine.pool)):
+        checkedout = getattr(pool, "checkedout", None)
+        if checkedout is not None:
+            stats[f"{name}_checked_out"] = checkedout()
+    return stats
+
+
+@app.get('/metrics', include_in_schema=False)
+async def get_metrics(request: Request):
+    if METRICS_TOKEN and not secrets.compare_digest(
+        request.headers.get("authorization", "").encode(), f"Bearer {METRICS_TOKEN}".encode()
+    ):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    body = metrics_registry.render({
+        "user_cache": user_cache.stats(),
+        "analytics_cache": analytics_cache.stats(),
+        "password_pool": password_pool_stats(),
+        "db_pool": _connection_pool_stats(),
+        "mail": mail_dispatcher.stats,
+        "notification_streams": notification_broker.stats(),
+    })
+    return Response(content=body, media_type=METRICS_CONTENT_TYPE)
+
+
+# -----------------------------
+# Admin Endpoints
+# -----------------------------
+
+
+@app.get('/admin/slow-queries', response_model=List[SlowQuerySchema])
+async def get_slow_queries(
+    limit: int = Query(50, ge=1, le=1000),
+    order: str = Query("slowest", pattern="^(slowest|recent)$"),
+    admin: Users = Depends(get_admin_user),
+):
+    return slow_query_log.entries(limit, order)
+
+
+@app.delete('/admin/slow-queries', status_code=status.HTTP_204_NO_CONTENT)
+async def clear_slow_queries(admin: Users = Depends(get_admin_user)):
+    slow_query_log.clear()
+
+
+# -----------------------------
+# Analytics Endpoints
+# -----------------------------
+
+
+# Analytics results scoped by owner; the write paths invalidate an owner's entries.
+analytics_cache = ScopedTTLCache(maxsize=ANALYTICS_CACHE_MAX_SIZE, ttl=ANALYTICS_CACHE_TTL_SECONDS)
+
+
+def _cached_analytics(owner_id: str, panel: str, days: int, compute):
+    return analytics_cache.get_or_compute(owner_id, (panel, days), compute)
+
+
+def _overview_from_totals(totals: dict) -> AnalyticsOverview:
+    return AnalyticsOverview(
+        total_projects=totals["projects"],
+        total_events=totals["events"],
+        total_volunteers=totals["volunteers"],
+        total_hours=totals["hours"],
+        total_applications=totals["applications"],
+        total_impact=totals["volunteers"] * 50,
     )
-    volunteers = [v for v in volunteer_query.all() if _volunteer_within_range(v, threshold=threshold)]
-    total_volunteers = len(volunteers)
-    total_hours = sum((v.hours_contributed if v.hours_contributed is not None else 15) for v in volunteers)
 
-    total_applications = (
-        db.query(ProjectApplicationModel)
+
+def _monthly_hours_points(sorted_points) -> List[AnalyticsMonthlyHoursPoint]:
+    return [
+        AnalyticsMonthlyHoursPoint(month=datetime.strptime(month, '%Y-%m').strftime('%b'), hours=hours)
+        for month, hours in sorted_points
+    ]
+
+
+def _category_metrics(db: Session, owner_id: str, threshold: datetime) -> List[AnalyticsCategoryMetric]:
+    category_counts = (
+        db.query(ProjectModel.category, func.count(ProjectModel.id))
+        .filter(ProjectModel.owner_id == owner_id)
+        .filter(ProjectModel.created_at >= threshold)
+        .group_by(ProjectModel.category)
+        .all()
+    )
+    return [AnalyticsCategoryMetric(name=category or "Uncategorized", value=count) for category, count in category_counts]
+
+
+def _skill_metrics(db: Session, owner_id: str, threshold: datetime) -> List[AnalyticsSkillMetric]:
+    skill_count = func.count(ProjectSkillModel.project_id)
+    top_skills = (
+        db.query(ProjectSkillModel.skill, skill_count)
+        .join(ProjectModel, ProjectSkillModel.project_id == ProjectModel.id)
+        .filter(ProjectModel.owner_id == owner_id)
+        .filter(ProjectModel.created_at >= threshold)
+        .group_by(ProjectSkillModel.skill)
+        .order_by(skill_count.desc(), ProjectSkillModel.skill)
+        .limit(5)
+        .all()
+    )
+    return [AnalyticsSkillMetric(name=name, value=value) for name, value in top_skills]
+
+
+def _application_stats(db: Session, owner_id: str, threshold: datetime) -> AnalyticsApplicationStats:
+    status_column = ProjectApplicationModel.status
+    total, pending, accepted, rejected = (
+        db.query(
+            func.count(ProjectApplicationModel.id),
+            func.count(case((status_column == ApplicationStatus.PENDING, 1))),
+            func.count(case((status_column == ApplicationStatus.ACCEPTED, 1))),
+            func.count(case((status_column == ApplicationStatus.REJECTED, 1))),
+        )
         .join(ProjectModel, ProjectApplicationModel.project_id == ProjectModel.id)
-        .filter(ProjectModel.owner_id == current_user.id)
+        .filter(ProjectModel.owner_id == owner_id)
         .filter(ProjectApplicationModel.applied_at >= threshold)
-        .count()
+        .one()
     )
+    return AnalyticsApplicationStats(total=total, pending=pending, accepted=accepted, rejected=rejected)
 
-    total_impact = total_volunteers * 50
 
-    return AnalyticsOverview(
-        total_projects=total_projects,
-        total_events=total_events,
-        total_volunteers=total_volunteers,
-        total_hours=total_hours,
-        total_applications=total_applications,
-        total_impact=total_impact,
+@app.get('/analytics/dashboard', response_model=AnalyticsDashboard)
+def get_analytics_dashboard(
+    days: int = Query(30, ge=1, le=365),
+    db: Session = Depends(get_db),
+    current_user: Users = Depends(get_current_user),
+):
+    # Every panel of the analytics page in four aggregate queries.
+    def compute():
+        threshold = _get_date_threshold(days)
+        totals, monthly_hours = rollup_summary(db, current_user.id, threshold.date())
+        return AnalyticsDashboard(
+            overview=_overview_from_totals(totals),
+            projects_by_category=_category_metrics(db, current_user.id, threshold),
+            skills_distribution=_skill_metrics(db, current_user.id, threshold),
+            monthly_hours=_monthly_hours_points(monthly_hours),
+            application_stats=_application_stats(db, current_user.id, threshold),
+        )
+
+    return _cached_analytics(current_user.id, "dashboard", days, compute)
+
+
+@app.get('/analytics/overview', response_model=AnalyticsOverview)
+def get_analytics_overview(
+    days: int = Query(30, ge=1, le=365),
+    db: Session = Depends(get_db),
+    current_user: Users = Depends(get_current_user),
+):
+    return _cached_analytics(
+        current_user.id,
+        "overview",
+        days,
+        lambda: _overview_from_totals(rollup_totals(db, current_user.id, _get_date_threshold(days).date())),
     )
 
 
@@ -562,18 +1085,13 @@ def get_projects_by_category(
     db: Session = Depends(get_db),
     current_user: Users = Depends(get_current_user),
 ):
-    threshold = _get_date_threshold(days)
-
-    category_counts = (
-        db.query(ProjectModel.category, func.count(ProjectModel.id))
-        .filter(ProjectModel.owner_id == current_user.id)
-        .filter(ProjectModel.created_at >= threshold)
-        .group_by(ProjectModel.category)
-        .all()
+    return _cached_analytics(
+        current_user.id,
+        "projects-by-category",
+        days,
+        lambda: _category_metrics(db, current_user.id, _get_date_threshold(days)),
     )
 
-    return [AnalyticsCategoryMetric(name=category or "Uncategorized", value=count) for category, count in category_counts]
-
 
 @app.get('/analytics/skills-distribution', response_model=List[AnalyticsSkillMetric])
 def get_skills_distribution(
@@ -581,27 +1099,13 @@ def get_skills_distribution(
     db: Session = Depends(get_db),
     current_user: Users = Depends(get_current_user),
 ):
-    threshold = _get_date_threshold(days)
-
-    projects = (
-        db.query(ProjectModel)
-        .filter(ProjectModel.owner_id == current_user.id)
-        .filter(ProjectModel.created_at >= threshold)
-        .all()
+    return _cached_analytics(
+        current_user.id,
+        "skills-distribution",
+        days,
+        lambda: _skill_metrics(db, current_user.id, _get_date_threshold(days)),
     )
 
-    skill_counter: Counter[str] = Counter()
-    for project in projects:
-        if not project.skills_needed:
-            continue
-        for skill in project.skills_needed:
-            normalized = str(skill).strip()
-            if normalized:
-                skill_counter[normalized] += 1
-
-    top_skills = skill_counter.most_common(5)
-    return [AnalyticsSkillMetric(name=name, value=value) for name, value in top_skills]
-
 
 @app.get('/analytics/monthly-hours', response_model=List[AnalyticsMonthlyHoursPoint])
 def get_monthly_hours(
@@ -609,32 +1113,13 @@ def get_monthly_hours(
     db: Session = Depends(get_db),
     current_user: Users = Depends(get_current_user),
 ):
-    threshold = _get_date_threshold(days)
-    threshold_utc = _normalize_to_utc(threshold) or threshold
-
-    volunteers = (
-        db.query(ProjectVolunteerModel)
-        .options(selectinload(ProjectVolunteerModel.project))
-        .join(ProjectModel, ProjectVolunteerModel.project_id == ProjectModel.id)
-        .filter(ProjectModel.owner_id == current_user.id)
-        .all()
+    return _cached_analytics(
+        current_user.id,
+        "monthly-hours",
+        days,
+        lambda: _monthly_hours_points(rollup_monthly_hours(db, current_user.id, _get_date_threshold(days).date())),
     )
 
-    monthly_hours: defaultdict[str, int] = defaultdict(int)
-    for volunteer in volunteers:
-        reference_date = volunteer.joined_at or (volunteer.project.created_at if volunteer.project else None)
-        reference_date = _normalize_to_utc(reference_date)
-        if not reference_date or reference_date < threshold_utc:
-            continue
-        month_key = reference_date.strftime('%Y-%m')
-        monthly_hours[month_key] += volunteer.hours_contributed if volunteer.hours_contributed is not None else 15
-
-    sorted_points = sorted(monthly_hours.items())
-    return [
-        AnalyticsMonthlyHoursPoint(month=datetime.strptime(month, '%Y-%m').strftime('%b'), hours=hours)
-        for month, hours in sorted_points
-    ]
-
 
 @app.get('/analytics/application-stats', response_model=AnalyticsApplicationStats)
 def get_application_stats(
@@ -642,28 +1127,11 @@ def get_application_stats(
     db: Session = Depends(get_db),
     current_user: Users = Depends(get_current_user),
 ):
-    threshold = _get_date_threshold(days)
-
-    base_query = (
-        db.query(ProjectApplicationModel)
-        .join(ProjectModel, ProjectApplicationModel.project_id == ProjectModel.id)
-        .filter(ProjectModel.owner_id == current_user.id)
-        .filter(ProjectApplicationModel.applied_at >= threshold)
-    )
-
-    total = base_query.count()
-    status_counts = dict(
-        base_query
-        .with_entities(ProjectApplicationModel.status, func.count(ProjectApplicationModel.id))
-        .group_by(ProjectApplicationModel.status)
-        .all()
-    )
-
-    return AnalyticsApplicationStats(
-        total=total,
-        pending=status_counts.get(ApplicationStatus.PENDING, 0),
-        accepted=status_counts.get(ApplicationStatus.ACCEPTED, 0),
-        rejected=status_counts.get(ApplicationStatus.REJECTED, 0),
+    return _cached_analytics(
+        current_user.id,
+        "application-stats",
+        days,
+        lambda: _application_stats(db, current_user.id, _get_date_threshold(days)),
     )
 
 
@@ -702,6 +1170,7 @@ def _update_application_status_impl(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid status value")
 
     application.status = new_status
+    stale_keys = [applications_key(project_id)]
 
     # If accepted, ensure a ProjectVolunteer record exists
     if new_status == ApplicationStatus.ACCEPTED and application.volunteer_id:
@@ -722,9 +1191,13 @@ def _update_application_status_impl(
                 status=VolunteerStatus.ACTIVE,
             )
             db.add(pv)
+            record_volunteer_joined(db, project.owner_id, pv.hours_contributed)
+            stale_keys.append(volunteers_key(project_id))
 
     db.add(application)
+    bump_versions(db, stale_keys)
     db.commit()
+    analytics_cache.invalidate_scope(project.owner_id)
     db.refresh(application)
     return application
 
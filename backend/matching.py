@@ -0,0 +1,177 @@
+import sys
+import uuid
+from datetime import datetime, timezone
+from typing import Iterable, Set
+
+from sqlalchemy import String, and_, cast, delete, exists, insert, or_, select, union
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from database import Base, SessionLocal, engine
+from models import Notification, NotificationType, Project, ProjectSkill, UserSkill, Users
+from notification_counts import record_notifications_created
+from notifications import notification_broker
+
+REBUILD_BATCH_SIZE = 1000
+
+
+def normalize_skill(value) -> str:
+    # Canonical index key: "Python", "python" and " PYTHON " are the same skill.
+    return " ".join(str(value).split()).casefold()
+
+
+def _normalized_set(values: Iterable | None) -> Set[str]:
+    if not values:
+        return set()
+    return {normalized for normalized in (normalize_skill(value) for value in values) if normalized}
+
+
+def _index_rows(user: Users) -> list[dict]:
+    rows = [{"user_id": user.id, "skill": skill, "is_interest": False} for skill in _normalized_set(user.skills)]
+    rows.extend(
+        {"user_id": user.id, "skill": interest, "is_interest": True} for interest in _normalized_set(user.interests)
+    )
+    return rows
+
+
+def sync_user_skills(db: Session, user: Users) -> None:
+    # Runs inside the caller's transaction so the index commits with the profile change.
+    db.execute(delete(UserSkill).where(UserSkill.user_id == user.id))
+    rows = _index_rows(user)
+    if rows:
+        db.execute(insert(UserSkill), rows)
+
+
+def project_skill_rows(project_id: str, skills_needed) -> list[dict]:
+    return [{"project_id": project_id, "skill": skill} for skill in _normalized_set(skills_needed)]
+
+
+def sync_project_skills(db: Session, project: Project) -> None:
+    # Flush first so the project row exists before its skill rows reference it.
+    db.flush()
+    db.execute(delete(ProjectSkill).where(ProjectSkill.project_id == project.id))
+    rows = project_skill_rows(project.id, project.skills_needed)
+    if rows:
+        db.execute(insert(ProjectSkill), rows)
+
+
+def _rebuild_index(db: Session, model, source, to_rows) -> int:
+    db.execute(delete(model))
+    indexed = 0
+    batch: list[dict] = []
+    for row in db.execute(source.execution_options(yield_per=REBUILD_BATCH_SIZE)):
+        batch.extend(to_rows(row))
+        if len(batch) >= REBUILD_BATCH_SIZE:
+            db.execute(insert(model), batch)
+            indexed += len(batch)
+            batch = []
+    if batch:
+        db.execute(insert(model), batch)
+        indexed += len(batch)
+    return indexed
+
+
+def rebuild_skill_indexes(db: Session) -> dict:
+    counts = {
+        "user_skills": _rebuild_index(db, UserSkill, select(Users), lambda row: _index_rows(row[0])),
+        "project_skills": _rebuild_index(
+            db,
+            ProjectSkill,
+            select(Project.id, Project.skills_needed),
+            lambda row: project_skill_rows(row.id, row.skills_needed),
+        ),
+    }
+    db.commit()
+    return counts
+
+
+def _has_stale_names(db: Session) -> bool:
+    # The distinct skill vocabulary is small and read from the skill indexes, so this
+    # stays cheap; it catches rows written under an older normalize_skill.
+    names = db.scalars(union(select(UserSkill.skill), select(ProjectSkill.skill)))
+    return any(normalize_skill(name) != name for name in names)
+
+
+def _needs_backfill(db: Session, index_model, source_columns) -> bool:
+    # An empty index over a source that has entries: a database from before the index
+    # existed. A JSON column counts as having entries unless it is null or [].
+    if db.scalar(select(exists().select_from(index_model))):
+        return False
+    has_entries = or_(*(
+        and_(column.isnot(None), cast(column, String).notin_(("[]", "null"))) for column in source_columns
+    ))
+    return bool(db.scalar(select(exists().where(has_entries))))
+
+
+def ensure_skill_indexes(engine: Engine) -> None:
+    # Called from ensure_schema, like search.ensure_search_index, so a deploy onto an
+    # existing database never serves skill filters or matches from an empty index.
+    with Session(engine) as db:
+        if (
+            _needs_backfill(db, UserSkill, [Users.skills, Users.interests])
+            or _needs_backfill(db, ProjectSkill, [Project.skills_needed])
+            or _has_stale_names(db)
+        ):
+            rebuild_skill_indexes(db)
+
+
+def notify_project_matches(project_id: str) -> int:
+    # Scheduled as a background task after create_project commits, so it owns its session.
+    db = SessionLocal()
+    try:
+        project = db.get(Project, project_id)
+        if project is None:
+            return 0
+
+        conditions = []
+        skills = _normalized_set(project.skills_needed)
+        if skills:
+            conditions.append(and_(UserSkill.is_interest.is_(False), UserSkill.skill.in_(skills)))
+        category = normalize_skill(project.category or "")
+        if category:
+            conditions.append(and_(UserSkill.is_interest.is_(True), UserSkill.skill == category))
+        if not conditions:
+            return 0
+
+        user_ids = db.scalars(
+            select(UserSkill.user_id)
+            .where(or_(*conditions), UserSkill.user_id != project.owner_id)
+            .distinct()
+        ).all()
+        if not user_ids:
+            return 0
+
+        created_at = datetime.now(timezone.utc)
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "project_id": project.id,
+                "type": NotificationType.PROJECT_MATCH,
+                "title": "New project matches your profile",
+                "message": f"{project.title} is looking for volunteers with your skills and interests.",
+                "project_title": project.title,
+                "read": False,
+                "created_at": created_at,
+            }
+            for user_id in user_ids
+        ]
+        db.execute(insert(Notification), rows)
+        record_notifications_created(db, user_ids)
+        db.commit()
+        notification_broker.publish(rows)
+        return len(user_ids)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["rebuild-index"]:
+        sys.exit("usage: python matching.py rebuild-index")
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        counts = rebuild_skill_indexes(session)
+        print(f"Indexed {counts['user_skills']} user and {counts['project_skills']} project skill entries")
+    finally:
+        session.close()
@@ -0,0 +1,240 @@
+import bisect
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from sqlalchemy import event
+from starlette.routing import Match
+
+# Prometheus text exposition format, version 0.0.4.
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Label for requests that match no route, so unknown paths cannot grow the label set.
+UNMATCHED_ROUTE = "unmatched"
+# Label for statements issued outside any request (startup, CLI tools).
+NO_ROUTE = "none"
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _RequestSQL:
+    # Statement totals for the request being handled; shared with the threadpool
+    # through the copied context, like database.RequestCheckouts.
+    __slots__ = ("route", "statements", "seconds")
+
+    def __init__(self, route: str):
+        self.route = route
+        self.statements = 0
+        self.seconds = 0.0
+
+
+_request_sql: ContextVar[Optional[_RequestSQL]] = ContextVar("metrics_request_sql", default=None)
+
+
+def current_route() -> Optional[str]:
+    # Route template of the request being handled, or None outside a request.
+    tracker = _request_sql.get()
+    return tracker.route if tracker is not None else None
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Dict[Tuple[str, str, str], int] = {}
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.in_flight: Dict[Tuple[str, str], int] = {}
+        self.sql_statements: Dict[str, int] = {}
+        self.sql_seconds: Dict[str, float] = {}
+        self.sql_latency = Histogram(SQL_BUCKETS)
+
+    def request_started(self, method: str, route: str) -> None:
+        with self._lock:
+            self.in_flight[(method, route)] = self.in_flight.get((method, route), 0) + 1
+
+    def request_finished(self, method: str, route: str, status_code: int, seconds: float, sql: _RequestSQL) -> None:
+        with self._lock:
+            self.in_flight[(method, route)] -= 1
+            key = (method, route, str(status_code))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            histogram = self.latency.get((method, route))
+            if histogram is None:
+                histogram = self.latency[(method, route)] = Histogram(HTTP_BUCKETS)
+            histogram.observe(seconds)
+            self._add_sql(route, sql.statements, sql.seconds)
+
+    def statement_finished(self, seconds: float) -> None:
+        tracker = _request_sql.get()
+        if tracker is not None:
+            tracker.statements += 1
+            tracker.seconds += seconds
+        with self._lock:
+            self.sql_latency.observe(seconds)
+            if tracker is None:
+                self._add_sql(NO_ROUTE, 1, seconds)
+
+    def _add_sql(self, route: str, statements: int, seconds: float) -> None:
+        if statements:
+            self.sql_statements[route] = self.sql_statements.get(route, 0) + statements
+            self.sql_seconds[route] = self.sql_seconds.get(route, 0.0) + seconds
+
+    def render(self, gauges: Mapping[str, Mapping[str, object]]) -> str:
+        with self._lock:
+            requests = dict(self.requests)
+            latency = {key: (list(h.counts), h.sum, h.count) for key, h in self.latency.items()}
+            in_flight = dict(self.in_flight)
+            sql_statements = dict(self.sql_statements)
+            sql_seconds = dict(self.sql_seconds)
+            sql_latency = (list(self.sql_latency.counts), self.sql_latency.sum, self.sql_latency.count)
+
+        lines: List[str] = []
+        _family(lines, "http_requests_total", "counter", "HTTP requests by route and status code.")
+        for (method, route, status_code), value in sorted(requests.items()):
+            lines.append(f"http_requests_total{_labels(method=method, route=route, status=status_code)} {value}")
+
+        _family(lines, "http_request_duration_seconds", "histogram", "HTTP request latency by route.")
+        for (method, route), values in sorted(latency.items()):
+            _histogram(lines, "http_request_duration_seconds", HTTP_BUCKETS, *values, method=method, route=route)
+
+        _family(lines, "http_requests_in_flight", "gauge", "HTTP requests currently being handled.")
+        for (method, route), value in sorted(in_flight.items()):
+            lines.append(f"http_requests_in_flight{_labels(method=method, route=route)} {value}")
+
+        _family(lines, "db_statements_total", "counter", "SQL statements executed, by the route that issued them.")
+        for route, value in sorted(sql_statements.items()):
+            lines.append(f"db_statements_total{_labels(route=route)} {value}")
+
+        _family(lines, "db_statement_seconds_total", "counter", "Time spent executing SQL, by route.")
+        for route, value in sorted(sql_seconds.items()):
+            lines.append(f"db_statement_seconds_total{_labels(route=route)} {_number(value)}")
+
+        _family(lines, "db_statement_duration_seconds", "histogram", "SQL statement latency.")
+        _histogram(lines, "db_statement_duration_seconds", SQL_BUCKETS, *sql_latency)
+
+        for group, stats in gauges.items():
+            for key, value in stats.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                name = f"{group}_{key}"
+                _family(lines, name, "gauge", f"{group} {key.replace('_', ' ')}.")
+                lines.append(f"{name} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: str) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _family(lines: List[str], name: str, kind: str, help_text: str) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _histogram(lines: List[str], name: str, buckets, counts, total: float, count: int, **labels: str) -> None:
+    cumulative = 0
+    for bound, bucket_count in zip(buckets, counts):
+        cumulative += bucket_count
+        lines.append(f"{name}_bucket{_labels(**labels, le=repr(bound))} {cumulative}")
+    lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {count}")
+    lines.append(f"{name}_sum{_labels(**labels)} {_number(total)}")
+    lines.append(f"{name}_count{_labels(**labels)} {count}")
+
+
+metrics_registry = MetricsRegistry()
+
+
+def _route_template(scope) -> str:
+    # Label requests by route template (/projects/{project_id}) rather than raw
+    # path. Mirrors the router's own matching; routes are few and checks cheap.
+    partial = None
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path
+    return partial or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    # Plain ASGI middleware, so the timing covers the whole response body,
+    # including streamed exports and background tasks.
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        method = scope["method"]
+        route = _route_template(scope)
+        tracker = _RequestSQL(route)
+        token = _request_sql.set(tracker)
+        status_code = 500
+        metrics_registry.request_started(method, route)
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics_registry.request_finished(method, route, status_code, time.perf_counter() - started, tracker)
+            _request_sql.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["metrics_started"].pop()
+    metrics_registry.statement_finished(time.perf_counter() - started)
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time.
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("metrics_started"):
+        conn.info["metrics_started"].pop()
+
+
+def instrument_engine(engine) -> None:
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,65 @@
+import sys
+from datetime import timezone
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from database import Base, SessionLocal, engine
+from models import Users
+from utils import uuid7
+
+# IDs issued by the old allocator were 3-digit strings; UUIDs are always 36 characters.
+LEGACY_ID_MAX_LENGTH = 35
+
+
+def _user_foreign_keys():
+    users_id = Users.__table__.c.id
+    for table in Base.metadata.sorted_tables:
+        for fk in table.foreign_keys:
+            if fk.column is users_id:
+                yield fk.parent
+
+
+def _time_ordered_id(created_at) -> str:
+    if created_at is None:
+        return str(uuid7())
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return str(uuid7(int(created_at.timestamp() * 1000)))
+
+
+def migrate_legacy_user_ids(db: Session) -> int:
+    users = Users.__table__
+    foreign_keys = list(_user_foreign_keys())
+    legacy_rows = db.execute(
+        select(users).where(func.length(users.c.id) <= LEGACY_ID_MAX_LENGTH)
+    ).mappings().all()
+
+    for row in legacy_rows:
+        old_id = row["id"]
+        new_id = _time_ordered_id(row["created_at"])
+        # Copy the row under its new ID, repoint children, then drop the old row.
+        # The unique email/phone are parked on the old row while both exist.
+        db.execute(
+            update(users)
+            .where(users.c.id == old_id)
+            .values(email=f"migrating-{old_id}@invalid", phonenumber=None)
+        )
+        db.execute(insert(users).values({**row, "id": new_id}))
+        for column in foreign_keys:
+            db.execute(update(column.table).where(column == old_id).values({column.name: new_id}))
+        db.execute(delete(users).where(users.c.id == old_id))
+
+    db.commit()
+    return len(legacy_rows)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:]:
+        sys.exit("usage: python migrate_user_ids.py")
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        print(f"Migrated {migrate_legacy_user_ids(session)} legacy user IDs")
+    finally:
+        session.close()
@@ -9,6 +9,7 @@ from sqlalchemy import (
     DateTime,
     Enum as SAEnum,
     ForeignKey,
+    Index,
     Integer,
     JSON,
     String,
@@ -68,10 +69,30 @@ class Users(Base):
     applications = relationship("ProjectApplication", back_populates="volunteer", cascade="all, delete-orphan")
     volunteer_roles = relationship("ProjectVolunteer", back_populates="volunteer", cascade="all, delete-orphan")
     notifications = relationship("Notification", back_populates="user", cascade="all, delete-orphan")
+    skill_index = relationship("UserSkill", back_populates="user", cascade="all, delete-orphan")
+
+
+# Inverted index over Users.skills / Users.interests, keyed by normalized skill.
+class UserSkill(Base):
+    __tablename__ = "user_skills"
+    __table_args__ = (
+        Index("ix_user_skills_skill_interest_user", "skill", "is_interest", "user_id"),
+    )
+
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    skill = Column(String(255), primary_key=True)
+    is_interest = Column(Boolean, primary_key=True, default=False)
+
+    user = relationship("Users", back_populates="skill_index")
 
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        Index("ix_projects_created_at_id", "created_at", "id"),
+        # Keyset pages of one owner's projects (GET /projects?owner_id=...).
+        Index("ix_projects_owner_created_id", "owner_id", "created_at", "id"),
+    )
 
     id = Column(String(36), primary_key=True, index=True)
     owner_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -93,6 +114,41 @@ class Project(Base):
     applications = relationship("ProjectApplication", back_populates="project", cascade="all, delete-orphan")
     volunteers = relationship("ProjectVolunteer", back_populates="project", cascade="all, delete-orphan")
     notifications = relationship("Notification", back_populates="project", cascade="all, delete-orphan")
+    skill_index = relationship("ProjectSkill", back_populates="project", cascade="all, delete-orphan")
+    variant_set = relationship(
+        "ImageVariantSet",
+        primaryjoin="foreign(Project.image_url) == ImageVariantSet.image_url",
+        viewonly=True,
+        uselist=False,
+    )
+
+    @property
+    def image_variants(self) -> dict:
+        # Resized WebP/AVIF renditions of an uploaded image_url, keyed "<size>_<format>".
+        return dict(self.variant_set.variants) if self.variant_set is not None else {}
+
+
+# Variants rendered for an uploaded image, recorded when rendering finishes, so
+# responses never have to look for them on disk.
+class ImageVariantSet(Base):
+    __tablename__ = "image_variants"
+
+    image_url = Column(String(512), primary_key=True)
+    variants = Column(JSON, nullable=False, default=dict)
+    rendered_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+# Normalized copy of Project.skills_needed, one row per (project, skill).
+class ProjectSkill(Base):
+    __tablename__ = "project_skills"
+    __table_args__ = (
+        Index("ix_project_skills_skill_project", "skill", "project_id"),
+    )
+
+    project_id = Column(String(36), ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    skill = Column(String(255), primary_key=True)
+
+    project = relationship("Project", back_populates="skill_index")
 
 
 class ProjectEvent(Base):
@@ -113,6 +169,10 @@ class ProjectEvent(Base):
 
 class ProjectApplication(Base):
     __tablename__ = "project_applications"
+    # Serves a project's application list and export in applied_at order without a sort.
+    __table_args__ = (
+        Index("ix_project_applications_project_applied", "project_id", "applied_at"),
+    )
 
     id = Column(String(36), primary_key=True, index=True)
     project_id = Column(String(36), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -132,6 +192,9 @@ class ProjectApplication(Base):
 
 class ProjectVolunteer(Base):
     __tablename__ = "project_volunteers"
+    __table_args__ = (
+        Index("ix_project_volunteers_project_joined", "project_id", "joined_at"),
+    )
 
     id = Column(String(36), primary_key=True, index=True)
     project_id = Column(String(36), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -147,6 +210,10 @@ class ProjectVolunteer(Base):
 
 class Notification(Base):
     __tablename__ = "notifications"
+    # Serves the unread count and the newest-first unread feed for a user.
+    __table_args__ = (
+        Index("ix_notifications_user_read_created", "user_id", "read", "created_at"),
+    )
 
     id = Column(String(36), primary_key=True, index=True)
     user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -161,3 +228,32 @@ class Notification(Base):
 
     user = relationship("Users", back_populates="notifications")
     project = relationship("Project", back_populates="notifications")
+
+
+# Unread notifications per user, maintained by the write paths (see notification_counts.py).
+class NotificationCounter(Base):
+    __tablename__ = "notification_counters"
+
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    unread = Column(Integer, nullable=False, default=0)
+
+
+# Per-owner, per-day analytics counters maintained by the write paths (see rollups.py).
+class AnalyticsDailyRollup(Base):
+    __tablename__ = "analytics_daily_rollups"
+
+    owner_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    projects = Column(Integer, nullable=False, default=0)
+    events = Column(Integer, nullable=False, default=0)
+    volunteers = Column(Integer, nullable=False, default=0)
+    hours = Column(Integer, nullable=False, default=0)
+    applications = Column(Integer, nullable=False, default=0)
+
+
+# Write counters for cacheable collections (see versions.py); backs response ETags.
+class ResourceVersion(Base):
+    __tablename__ = "resource_versions"
+
+    key = Column(String(255), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,82 @@
+import sys
+from collections import Counter
+from typing import Iterable
+
+from sqlalchemy import delete, exists, false, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from database import Base, SessionLocal, engine
+from models import Notification, NotificationCounter
+
+
+def record_notifications_created(db: Session, user_ids: Iterable[str]) -> None:
+    # Called before the caller commits, one user_id per inserted unread notification,
+    # so the counters land in the same transaction as the rows.
+    rows = [{"user_id": user_id, "unread": count} for user_id, count in Counter(user_ids).items()]
+    if not rows:
+        return
+    table = NotificationCounter.__table__
+    dialect = db.get_bind().dialect.name
+
+    if dialect in ("sqlite", "postgresql"):
+        dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id],
+            set_={"unread": table.c.unread + stmt.excluded.unread},
+        )
+        db.execute(stmt, rows)
+        return
+
+    for row in rows:
+        updated = db.execute(
+            update(table).where(table.c.user_id == row["user_id"]).values(unread=table.c.unread + row["unread"])
+        )
+        if updated.rowcount == 0:
+            db.execute(insert(table).values(row))
+
+
+def record_notifications_read(db: Session, user_id: str, count: int) -> None:
+    # count is the rowcount of the caller's read=false -> true UPDATE, so each
+    # notification is subtracted once however many requests race to mark it.
+    if count:
+        table = NotificationCounter.__table__
+        db.execute(update(table).where(table.c.user_id == user_id).values(unread=table.c.unread - count))
+
+
+def unread_count(db: Session, user_id: str) -> int:
+    return db.scalar(select(NotificationCounter.unread).where(NotificationCounter.user_id == user_id)) or 0
+
+
+def rebuild_unread_counts(db: Session) -> int:
+    unread = (
+        select(Notification.user_id, func.count())
+        .where(Notification.read == false())
+        .group_by(Notification.user_id)
+    )
+    db.execute(delete(NotificationCounter))
+    db.execute(insert(NotificationCounter).from_select(["user_id", "unread"], unread))
+    db.commit()
+    return db.scalar(select(func.count()).select_from(NotificationCounter))
+
+
+def ensure_unread_counts(engine: Engine) -> None:
+    # Backfills a database whose notifications predate the counters.
+    with Session(engine) as db:
+        if not db.scalar(select(exists().select_from(NotificationCounter))) and db.scalar(
+            select(exists().where(Notification.read == false()))
+        ):
+            rebuild_unread_counts(db)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["rebuild"]:
+        sys.exit("usage: python notification_counts.py rebuild")
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        print(f"Rebuilt unread counts for {rebuild_unread_counts(session)} users")
+    finally:
+        session.close()
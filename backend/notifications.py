@@ -0,0 +1,69 @@
+import asyncio
+import json
+import logging
+from typing import Dict, Iterable, Optional, Set
+
+from schemas import Notification as NotificationSchema
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per open stream; a client that falls further behind loses the
+# overflow and should refetch GET /notifications.
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class NotificationBroker:
+    # In-process fan-out of new notification rows to open SSE streams. Subscribers
+    # live on the event loop; publish() may be called from any thread (e.g. a
+    # background task running in the threadpool) and hops onto the loop.
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        self._loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[user_id]
+
+    def publish(self, rows: Iterable[dict]) -> None:
+        loop = self._loop
+        if loop is None:
+            return
+        events = [(row["user_id"], format_event(row)) for row in rows]
+        try:
+            loop.call_soon_threadsafe(self._deliver, events)
+        except RuntimeError:
+            # The loop that served the streams has shut down.
+            self._loop = None
+
+    def stats(self) -> dict:
+        return {
+            "subscribed_users": len(self._subscribers),
+            "open": sum(len(queues) for queues in self._subscribers.values()),
+        }
+
+    def _deliver(self, events) -> None:
+        for user_id, event in events:
+            for queue in self._subscribers.get(user_id, ()):
+                try:
+                    queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    logger.warning("Notification stream for user %s is full; dropping event", user_id)
+
+
+def format_event(row: dict) -> str:
+    payload = NotificationSchema.model_validate(row).model_dump(mode="json")
+    return f"id: {payload['id']}\nevent: notification\ndata: {json.dumps(payload)}\n\n"
+
+
+notification_broker = NotificationBroker()
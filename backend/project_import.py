@@ -0,0 +1,227 @@
+import csv
+import heapq
+import io
+import json
+import os
+import uuid
+from typing import BinaryIO, Callable, Iterator, List, NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from matching import project_skill_rows
+from models import Project, ProjectEvent, ProjectSkill, ProjectType
+from rollups import record_projects_imported
+from schemas import DEFAULT_PROJECT_IMAGE_URL, ProjectCreate
+from versions import PROJECTS_KEY, bump_versions
+
+IMPORT_BATCH_SIZE = int(os.getenv("PROJECT_IMPORT_BATCH_SIZE", "500"))
+MAX_REPORTED_IMPORT_ERRORS = 100
+IMPORT_FORMATS = ("jsonl", "csv")
+
+_FORMAT_BY_SUFFIX = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}
+_FORMAT_BY_CONTENT_TYPE = {
+    "application/jsonl": "jsonl",
+    "application/x-ndjson": "jsonl",
+    "application/x-jsonlines": "jsonl",
+    "text/csv": "csv",
+}
+
+# (line number, record or None, error or None)
+ImportRecord = Tuple[int, Optional[dict], Optional[str]]
+
+
+class ImportResult(NamedTuple):
+    project_ids: List[str]
+    failed: int
+    errors: List[dict]
+
+
+class _ImportErrors:
+    # Counts every failed line but keeps only the MAX_REPORTED_IMPORT_ERRORS lowest
+    # line numbers, so a badly formed upload costs O(1) memory. Lines mostly arrive
+    # in order; a failed batch reports its lines after later validation errors.
+    def __init__(self, limit: int = MAX_REPORTED_IMPORT_ERRORS):
+        self.limit = limit
+        self.count = 0
+        self._kept: List[Tuple[int, int, str]] = []  # max-heap on line via (-line, -seq)
+
+    def add(self, line: int, error: str) -> None:
+        self.count += 1
+        entry = (-line, -self.count, error)
+        if len(self._kept) < self.limit:
+            heapq.heappush(self._kept, entry)
+        elif entry > self._kept[0]:
+            heapq.heapreplace(self._kept, entry)
+
+    def reported(self) -> List[dict]:
+        return [{"line": -line, "error": error} for line, _, error in sorted(self._kept, reverse=True)]
+
+
+def detect_import_format(filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    suffix = os.path.splitext(filename or "")[1].lower()
+    if suffix in _FORMAT_BY_SUFFIX:
+        return _FORMAT_BY_SUFFIX[suffix]
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    return _FORMAT_BY_CONTENT_TYPE.get(media_type)
+
+
+def _csv_record(row: dict) -> dict:
+    # Empty cells fall back to the schema defaults. events is a JSON array;
+    # skills_needed is either a JSON array or a ";"-separated list.
+    record = {}
+    for key, value in row.items():
+        if key is None or value is None or value.strip() == "":
+            continue
+        key = key.strip()
+        if key == "events":
+            value = json.loads(value)
+        elif key == "skills_needed":
+            value = json.loads(value) if value.lstrip().startswith("[") else [
+                skill.strip() for skill in value.split(";") if skill.strip()
+            ]
+        record[key] = value
+    return record
+
+
+def iter_records(source: BinaryIO, fmt: str) -> Iterator[ImportRecord]:
+    # Decodes the upload lazily, one line (JSONL) or one record (CSV) at a time.
+    text = io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+    line_number = 0
+    try:
+        if fmt == "jsonl":
+            for line_number, line in enumerate(text, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    yield line_number, None, f"Invalid JSON: {exc.msg}"
+                    continue
+                if not isinstance(record, dict):
+                    yield line_number, None, "Each line must be a JSON object"
+                    continue
+                yield line_number, record, None
+        else:
+            reader = csv.DictReader(text)
+            for row in reader:
+                line_number = reader.line_num
+                try:
+                    yield line_number, _csv_record(row), None
+                except json.JSONDecodeError as exc:
+                    yield line_number, None, f"Invalid JSON in events or skills_needed: {exc.msg}"
+    except UnicodeDecodeError:
+        yield line_number + 1, None, "File is not valid UTF-8; import stopped here"
+    except csv.Error as exc:
+        yield line_number + 1, None, f"Malformed CSV ({exc}); import stopped here"
+    finally:
+        # Leave the upload open for the caller to close.
+        if not source.closed:
+            text.detach()
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'record'}: {error['msg']}" for error in exc.errors()
+    )
+
+
+def _row_batches(
+    owner_id: str,
+    records: Iterator[ImportRecord],
+    normalize_image_url: Callable[[str], str],
+    errors: _ImportErrors,
+    batch_size: int,
+) -> Iterator[List[Tuple[int, dict, List[dict]]]]:
+    batch: List[Tuple[int, dict, List[dict]]] = []
+    for line_number, record, error in records:
+        if error is None:
+            try:
+                details = ProjectCreate.model_validate(record)
+                if details.end_date < details.start_date:
+                    raise ValueError("End date must be on or after the start date")
+                image_url = normalize_image_url(details.image_url or DEFAULT_PROJECT_IMAGE_URL)
+            except ValidationError as exc:
+                error = _validation_message(exc)
+            except HTTPException as exc:
+                error = str(exc.detail)
+            except ValueError as exc:
+                error = str(exc)
+        if error is not None:
+            errors.add(line_number, error)
+            continue
+
+        project_id = str(uuid.uuid4())
+        project = {
+            "id": project_id,
+            "owner_id": owner_id,
+            "title": details.title,
+            "short_description": details.short_description,
+            "detailed_description": details.detailed_description,
+            "category": details.category,
+            "project_type": ProjectType(details.project_type.value),
+            "location": details.location,
+            "image_url": image_url,
+            "skills_needed": details.skills_needed,
+            "start_date": details.start_date,
+            "end_date": details.end_date,
+        }
+        events = [
+            {
+                "id": str(uuid.uuid4()),
+                "project_id": project_id,
+                "name": event.name,
+                "description": event.description,
+                "date": event.date,
+                "time": event.time,
+                "slots_available": event.slots_available,
+            }
+            for event in details.events
+        ]
+        batch.append((line_number, project, events))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def import_projects(
+    db: Session,
+    owner_id: str,
+    records: Iterator[ImportRecord],
+    normalize_image_url: Callable[[str], str],
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> ImportResult:
+    # Valid rows are inserted with one executemany per table and committed per
+    # batch, so a failed batch only loses its own rows. The search index is
+    # maintained by the database, exactly as for single inserts.
+    project_ids: List[str] = []
+    errors = _ImportErrors()
+    for batch in _row_batches(owner_id, records, normalize_image_url, errors, batch_size):
+        projects = [project for _, project, _ in batch]
+        events = [event for _, _, project_events in batch for event in project_events]
+        skills = [
+            row for project in projects for row in project_skill_rows(project["id"], project["skills_needed"])
+        ]
+        try:
+            db.execute(insert(Project), projects)
+            if events:
+                db.execute(insert(ProjectEvent), events)
+            if skills:
+                db.execute(insert(ProjectSkill), skills)
+            record_projects_imported(db, owner_id, len(projects), (event["date"] for event in events))
+            bump_versions(db, [PROJECTS_KEY])
+            db.commit()
+        except SQLAlchemyError as exc:
+            db.rollback()
+            message = f"Database error: {getattr(exc, 'orig', exc)}"
+            for line_number, _, _ in batch:
+                errors.add(line_number, message)
+            continue
+        project_ids.extend(project["id"] for project in projects)
+
+    return ImportResult(project_ids, errors.count, errors.reported())
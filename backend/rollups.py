@@ -0,0 +1,200 @@
+import sys
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, exists, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from database import Base, SessionLocal, engine
+from models import (
+    AnalyticsDailyRollup,
+    Project,
+    ProjectApplication,
+    ProjectEvent,
+    ProjectVolunteer,
+)
+
+ROLLUP_METRICS = ("projects", "events", "volunteers", "hours", "applications")
+DEFAULT_VOLUNTEER_HOURS = 15
+REBUILD_BATCH_SIZE = 1000
+
+RollupKey = Tuple[str, date]
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def _as_utc_date(dt: Optional[datetime]) -> Optional[date]:
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        return dt.date()
+    return dt.astimezone(timezone.utc).date()
+
+
+def volunteer_hours(hours_contributed: Optional[int]) -> int:
+    return hours_contributed if hours_contributed is not None else DEFAULT_VOLUNTEER_HOURS
+
+
+def _rollup_rows(deltas: Dict[RollupKey, Dict[str, int]]) -> List[dict]:
+    return [
+        {"owner_id": owner_id, "day": day, **{metric: values.get(metric, 0) for metric in ROLLUP_METRICS}}
+        for (owner_id, day), values in deltas.items()
+    ]
+
+
+def _upsert_increments(db: Session, deltas: Dict[RollupKey, Dict[str, int]]) -> None:
+    if not deltas:
+        return
+    table = AnalyticsDailyRollup.__table__
+    dialect = db.get_bind().dialect.name
+    rows = _rollup_rows(deltas)
+
+    if dialect in ("sqlite", "postgresql"):
+        dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.owner_id, table.c.day],
+            set_={metric: table.c[metric] + stmt.excluded[metric] for metric in ROLLUP_METRICS},
+        )
+        db.execute(stmt, rows)
+        return
+
+    for row in rows:
+        updated = db.execute(
+            update(table)
+            .where(table.c.owner_id == row["owner_id"], table.c.day == row["day"])
+            .values({metric: table.c[metric] + row[metric] for metric in ROLLUP_METRICS})
+        )
+        if updated.rowcount == 0:
+            db.execute(insert(table).values(row))
+
+
+def record_projects_created(db: Session, projects: Iterable[Project]) -> None:
+    # Called before the caller commits so the counters land in the same transaction.
+    deltas: Dict[RollupKey, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    today = utc_today()
+    for project in projects:
+        deltas[(project.owner_id, today)]["projects"] += 1
+        for event in project.events:
+            deltas[(project.owner_id, event.date)]["events"] += 1
+    _upsert_increments(db, deltas)
+
+
+def record_projects_imported(db: Session, owner_id: str, project_count: int, event_dates: Iterable[date]) -> None:
+    # Same counters as record_projects_created, from the plain rows a bulk import inserts.
+    deltas: Dict[RollupKey, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    if project_count:
+        deltas[(owner_id, utc_today())]["projects"] += project_count
+    for event_date in event_dates:
+        deltas[(owner_id, event_date)]["events"] += 1
+    _upsert_increments(db, deltas)
+
+
+def record_application(db: Session, owner_id: str) -> None:
+    _upsert_increments(db, {(owner_id, utc_today()): {"applications": 1}})
+
+
+def record_volunteer_joined(db: Session, owner_id: str, hours_contributed: Optional[int] = None) -> None:
+    _upsert_increments(
+        db, {(owner_id, utc_today()): {"volunteers": 1, "hours": volunteer_hours(hours_contributed)}}
+    )
+
+
+def rollup_totals(db: Session, owner_id: str, since: date) -> Dict[str, int]:
+    table = AnalyticsDailyRollup.__table__
+    row = db.execute(
+        select(*(func.coalesce(func.sum(table.c[metric]), 0).label(metric) for metric in ROLLUP_METRICS))
+        .where(table.c.owner_id == owner_id, table.c.day >= since)
+    ).one()
+    return {metric: int(row._mapping[metric]) for metric in ROLLUP_METRICS}
+
+
+def _monthly_hours(days: Iterable[Tuple[date, int]]) -> List[Tuple[str, int]]:
+    monthly: Dict[str, int] = defaultdict(int)
+    for day, hours in days:
+        if hours:
+            monthly[day.strftime('%Y-%m')] += hours
+    return sorted(monthly.items())
+
+
+def rollup_monthly_hours(db: Session, owner_id: str, since: date) -> List[Tuple[str, int]]:
+    rows = db.execute(
+        select(AnalyticsDailyRollup.day, AnalyticsDailyRollup.hours)
+        .where(
+            AnalyticsDailyRollup.owner_id == owner_id,
+            AnalyticsDailyRollup.day >= since,
+            AnalyticsDailyRollup.hours > 0,
+        )
+    )
+    return _monthly_hours(rows)
+
+
+def rollup_summary(db: Session, owner_id: str, since: date) -> Tuple[Dict[str, int], List[Tuple[str, int]]]:
+    # Totals and monthly hours from a single scan of the owner's rollup rows.
+    table = AnalyticsDailyRollup.__table__
+    rows = db.execute(
+        select(table.c.day, *(table.c[metric] for metric in ROLLUP_METRICS))
+        .where(table.c.owner_id == owner_id, table.c.day >= since)
+    ).all()
+    totals = {metric: sum(row._mapping[metric] for row in rows) for metric in ROLLUP_METRICS}
+    return totals, _monthly_hours((row.day, row.hours) for row in rows)
+
+
+def rebuild_rollups(db: Session) -> int:
+    deltas: Dict[RollupKey, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def stream(stmt):
+        return db.execute(stmt.execution_options(yield_per=REBUILD_BATCH_SIZE))
+
+    for owner_id, created_at in stream(select(Project.owner_id, Project.created_at)):
+        deltas[(owner_id, _as_utc_date(created_at))]["projects"] += 1
+    for owner_id, event_date in stream(
+        select(Project.owner_id, ProjectEvent.date).join(Project, ProjectEvent.project_id == Project.id)
+    ):
+        deltas[(owner_id, event_date)]["events"] += 1
+    for owner_id, applied_at in stream(
+        select(Project.owner_id, ProjectApplication.applied_at)
+        .join(Project, ProjectApplication.project_id == Project.id)
+    ):
+        deltas[(owner_id, _as_utc_date(applied_at))]["applications"] += 1
+    for owner_id, joined_at, created_at, hours_contributed in stream(
+        select(Project.owner_id, ProjectVolunteer.joined_at, Project.created_at, ProjectVolunteer.hours_contributed)
+        .join(Project, ProjectVolunteer.project_id == Project.id)
+    ):
+        counters = deltas[(owner_id, _as_utc_date(joined_at or created_at))]
+        counters["volunteers"] += 1
+        counters["hours"] += volunteer_hours(hours_contributed)
+
+    rows = _rollup_rows({key: values for key, values in deltas.items() if key[1] is not None})
+    db.execute(delete(AnalyticsDailyRollup))
+    for start in range(0, len(rows), REBUILD_BATCH_SIZE):
+        db.execute(insert(AnalyticsDailyRollup), rows[start:start + REBUILD_BATCH_SIZE])
+    db.commit()
+    return len(rows)
+
+
+def ensure_rollups(engine: Engine) -> None:
+    # Every project contributes at least its creation day, so an empty rollup table
+    # next to existing projects means the table predates them; backfill it before
+    # the dashboard reports zeros.
+    with Session(engine) as db:
+        if db.scalar(select(exists().select_from(Project))) and not db.scalar(
+            select(exists().select_from(AnalyticsDailyRollup))
+        ):
+            rebuild_rollups(db)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["rebuild"]:
+        sys.exit("usage: python rollups.py rebuild")
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        print(f"Rebuilt {rebuild_rollups(session)} daily rollup rows")
+    finally:
+        session.close()
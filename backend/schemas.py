@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import date, datetime
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field, field_validator, EmailStr
 
@@ -153,6 +153,18 @@ class ProjectCreate(ProjectBase):
     events: List[ProjectEventCreate] = Field(default_factory=list)
 
 
+class ProjectImportError(BaseModel):
+    line: int
+    error: str
+
+
+class ProjectImportResult(BaseModel):
+    imported: int
+    failed: int
+    # First 100 failures, by line number.
+    errors: List[ProjectImportError] = Field(default_factory=list)
+
+
 class ProjectOwnerSummary(BaseModel):
     id: str
     name: Optional[str] = None
@@ -171,6 +183,9 @@ class Project(ProjectBase):
     events: List[ProjectEvent] = Field(default_factory=list)
     owner: Optional[ProjectOwnerSummary] = None
 
+    # Resized WebP/AVIF renditions of an uploaded image_url, keyed "<size>_<format>".
+    image_variants: Dict[str, str] = Field(default_factory=dict)
+
     class Config:
         from_attributes = True
 
@@ -241,6 +256,55 @@ class ProjectVolunteer(BaseModel):
         from_attributes = True
 
 
+# -----------------------------
+# Notification Schemas
+# -----------------------------
+
+
+class Notification(BaseModel):
+    id: str
+    type: NotificationTypeEnum
+    title: str
+    message: str
+    project_id: Optional[str] = None
+    project_title: Optional[str] = None
+    read: bool
+    created_at: datetime
+    read_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class NotificationMarkRead(BaseModel):
+    # Omit ids to mark every unread notification as read.
+    ids: Optional[List[str]] = Field(default=None, max_length=500)
+
+
+class NotificationReadResult(BaseModel):
+    updated: int
+
+
+class NotificationUnreadCount(BaseModel):
+    unread: int
+
+
+# -----------------------------
+# Admin Schemas
+# -----------------------------
+
+
+class SlowQuery(BaseModel):
+    recorded_at: datetime
+    duration_ms: float
+    route: Optional[str] = None
+    statement: str
+    parameters: str
+    executemany: bool = False
+    # EXPLAIN / EXPLAIN QUERY PLAN output; only captured for SELECT statements.
+    plan: Optional[List[str]] = None
+
+
 # -----------------------------
 # Analytics Schemas
 # -----------------------------
@@ -274,4 +338,12 @@ class AnalyticsApplicationStats(BaseModel):
     total: int = 0
     pending: int = 0
     accepted: int = 0
-    rejected: int = 0
\ No newline at end of file
+    rejected: int = 0
+
+
+class AnalyticsDashboard(BaseModel):
+    overview: AnalyticsOverview
+    projects_by_category: List[AnalyticsCategoryMetric] = Field(default_factory=list)
+    skills_distribution: List[AnalyticsSkillMetric] = Field(default_factory=list)
+    monthly_hours: List[AnalyticsMonthlyHoursPoint] = Field(default_factory=list)
+    application_stats: AnalyticsApplicationStats
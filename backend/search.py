@@ -0,0 +1,178 @@
+import re
+from typing import List
+
+from sqlalchemy import and_, false, inspect, or_, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from models import Project
+
+SQLITE_FTS_TABLE = "projects_fts"
+# Stable integer key for the FTS rows, maintained by the index triggers on SQLite only.
+SQLITE_SEARCH_ROWID = "search_rowid"
+SEARCH_COLUMNS = ("title", "short_description", "detailed_description", "category", "skills_needed")
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+_MAX_QUERY_TOKENS = 16
+
+# bm25 weights, in SEARCH_COLUMNS order; lower scores rank higher in FTS5.
+_SQLITE_RANK = f"bm25({SQLITE_FTS_TABLE}, 10.0, 4.0, 1.0, 4.0, 4.0)"
+
+_POSTGRES_VECTOR = """
+    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(short_description, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(category, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(skills_needed::text, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(detailed_description, '')), 'C')
+"""
+
+
+def _query_tokens(raw: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(raw.lower())[:_MAX_QUERY_TOKENS]
+
+
+def _sqlite_match(tokens: List[str]) -> str:
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def _postgres_tsquery(tokens: List[str]) -> str:
+    return " & ".join(f"{token}:*" for token in tokens)
+
+
+def _substring_filters(tokens: List[str]):
+    return [
+        or_(
+            Project.title.ilike(f"%{token}%"),
+            Project.short_description.ilike(f"%{token}%"),
+            Project.detailed_description.ilike(f"%{token}%"),
+            Project.category.ilike(f"%{token}%"),
+        )
+        for token in tokens
+    ]
+
+
+def _ensure_sqlite_index(engine: Engine) -> None:
+    columns = ", ".join(SEARCH_COLUMNS)
+    new_columns = ", ".join(f"new.{column}" for column in SEARCH_COLUMNS)
+    old_columns = ", ".join(f"old.{column}" for column in SEARCH_COLUMNS)
+    inspector = inspect(engine)
+    created = not inspector.has_table(SQLITE_FTS_TABLE)
+    # Indexes built before search_rowid existed were keyed on projects.rowid.
+    keyed_on_rowid = SQLITE_SEARCH_ROWID not in {column["name"] for column in inspector.get_columns("projects")}
+
+    with engine.begin() as conn:
+        if keyed_on_rowid:
+            conn.exec_driver_sql(f"ALTER TABLE projects ADD COLUMN {SQLITE_SEARCH_ROWID} INTEGER")
+            conn.exec_driver_sql(f"UPDATE projects SET {SQLITE_SEARCH_ROWID} = rowid")
+            for suffix in ("ai", "ad", "au"):
+                conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_{suffix}")
+            conn.exec_driver_sql(f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}")
+            created = True
+        conn.exec_driver_sql(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS ix_projects_{SQLITE_SEARCH_ROWID} ON projects ({SQLITE_SEARCH_ROWID})"
+        )
+        # External-content table: the index stores only tokens, rows stay in `projects`.
+        # It is keyed on search_rowid rather than the implicit rowid, which VACUUM may
+        # renumber because `projects` has no INTEGER PRIMARY KEY.
+        conn.exec_driver_sql(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5("
+            f"{columns}, content='projects', content_rowid='{SQLITE_SEARCH_ROWID}', "
+            f"tokenize='unicode61', prefix='2 3')"
+        )
+        # The ORM never sets search_rowid; new rows take the next free number here.
+        conn.exec_driver_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_ai AFTER INSERT ON projects BEGIN "
+            f"UPDATE projects SET {SQLITE_SEARCH_ROWID} = "
+            f"(SELECT coalesce(max({SQLITE_SEARCH_ROWID}), 0) + 1 FROM projects) WHERE rowid = new.rowid; "
+            f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, {columns}) "
+            f"SELECT {SQLITE_SEARCH_ROWID}, {columns} FROM projects WHERE rowid = new.rowid; END"
+        )
+        conn.exec_driver_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_ad AFTER DELETE ON projects BEGIN "
+            f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, {columns}) "
+            f"VALUES ('delete', old.{SQLITE_SEARCH_ROWID}, {old_columns}); END"
+        )
+        # Only fires for indexed columns, so the search_rowid assignment above does not.
+        conn.exec_driver_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_au AFTER UPDATE OF {columns} ON projects BEGIN "
+            f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, {columns}) "
+            f"VALUES ('delete', old.{SQLITE_SEARCH_ROWID}, {old_columns}); "
+            f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, {columns}) VALUES (new.{SQLITE_SEARCH_ROWID}, {new_columns}); END"
+        )
+        if created:
+            conn.exec_driver_sql(f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')")
+
+
+def _ensure_postgres_index(engine: Engine) -> None:
+    with engine.begin() as conn:
+        # A stored generated column keeps the vector current on every insert/update.
+        conn.exec_driver_sql(
+            f"ALTER TABLE projects ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({_POSTGRES_VECTOR}) STORED"
+        )
+        conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS ix_projects_search_vector ON projects USING GIN (search_vector)"
+        )
+
+
+def ensure_search_index(engine: Engine) -> None:
+    if engine.dialect.name == "sqlite":
+        _ensure_sqlite_index(engine)
+    elif engine.dialect.name == "postgresql":
+        _ensure_postgres_index(engine)
+
+
+def search_project_ids(db: Session, raw_query: str, *, skip: int = 0, limit: int = 20) -> List[str]:
+    tokens = _query_tokens(raw_query)
+    if not tokens:
+        return []
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        match = _sqlite_match(tokens)
+        rows = db.execute(
+            text(
+                f"SELECT p.id FROM {SQLITE_FTS_TABLE} JOIN projects p ON p.{SQLITE_SEARCH_ROWID} = {SQLITE_FTS_TABLE}.rowid "
+                f"WHERE {SQLITE_FTS_TABLE} MATCH :match ORDER BY {_SQLITE_RANK} LIMIT :limit OFFSET :skip"
+            ),
+            {"match": match, "limit": limit, "skip": skip},
+        )
+        return [row[0] for row in rows]
+
+    if dialect == "postgresql":
+        tsquery = _postgres_tsquery(tokens)
+        rows = db.execute(
+            text(
+                "SELECT id FROM projects, to_tsquery('english', :tsquery) AS query "
+                "WHERE search_vector @@ query "
+                "ORDER BY ts_rank_cd(search_vector, query) DESC, created_at DESC "
+                "LIMIT :limit OFFSET :skip"
+            ),
+            {"tsquery": tsquery, "limit": limit, "skip": skip},
+        )
+        return [row[0] for row in rows]
+
+    # No text index on other backends: fall back to unranked substring matching.
+    query = db.query(Project.id).filter(*_substring_filters(tokens))
+    rows = query.order_by(Project.created_at.desc()).offset(skip).limit(limit).all()
+    return [row[0] for row in rows]
+
+
+def project_search_filter(db: Session, raw_query: str):
+    # WHERE clause keeping only projects that match raw_query, answered by the same
+    # text index as search_project_ids (every term must match, as a prefix).
+    tokens = _query_tokens(raw_query)
+    if not tokens:
+        return false()
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        return text(
+            f"projects.{SQLITE_SEARCH_ROWID} IN "
+            f"(SELECT rowid FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH :search_match)"
+        ).bindparams(search_match=_sqlite_match(tokens))
+    if dialect == "postgresql":
+        return text("projects.search_vector @@ to_tsquery('english', :search_tsquery)").bindparams(
+            search_tsquery=_postgres_tsquery(tokens)
+        )
+    return and_(*_substring_filters(tokens))
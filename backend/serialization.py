@@ -0,0 +1,103 @@
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Iterable, List
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+from schemas import DEFAULT_PROJECT_IMAGE_URL
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is a declared dependency
+    orjson = None
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return json.dumps(content, default=_json_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    # Encodes plain dicts/lists built from trusted rows, skipping response_model
+    # validation. Output matches Pydantic's JSON mode (UTC datetimes end in "Z").
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def fast_json_response(content: Any, response: Response) -> FastJSONResponse:
+    # Returning a Response bypasses FastAPI's merge of the injected response's
+    # headers (ETag, cursors), so carry them over here.
+    fast = FastJSONResponse(content)
+    fast.raw_headers.extend(
+        (name, value) for name, value in response.raw_headers if name != b"content-length"
+    )
+    return fast
+
+
+def _event_dict(event) -> dict:
+    return {
+        "name": event.name,
+        "description": event.description,
+        "date": event.date,
+        "time": event.time,
+        "slots_available": event.slots_available,
+        "id": event.id,
+        "created_at": event.created_at,
+        "updated_at": event.updated_at,
+    }
+
+
+def _owner_dict(owner) -> dict:
+    return {
+        "id": owner.id,
+        "name": owner.name,
+        "email": owner.email,
+        "phonenumber": owner.phonenumber,
+    }
+
+
+def project_dict(project) -> dict:
+    # Same keys, order and values as schemas.Project for a row loaded with its
+    # owner and events; benchmarks/bench_serialization.py checks they stay equal.
+    image_url = project.image_url
+    if image_url is None or not image_url.strip():
+        image_url = DEFAULT_PROJECT_IMAGE_URL
+    skills = project.skills_needed
+    return {
+        "title": project.title,
+        "short_description": project.short_description,
+        "detailed_description": project.detailed_description,
+        "category": project.category,
+        "project_type": project.project_type.value,
+        "location": project.location,
+        "image_url": image_url,
+        "skills_needed": skills if isinstance(skills, list) else [],
+        "start_date": project.start_date,
+        "end_date": project.end_date,
+        "id": project.id,
+        "owner_id": project.owner_id,
+        "created_at": project.created_at,
+        "updated_at": project.updated_at,
+        "events": [_event_dict(event) for event in project.events],
+        "owner": _owner_dict(project.owner) if project.owner is not None else None,
+        "image_variants": project.image_variants,
+    }
+
+
+def project_list(projects: Iterable) -> List[dict]:
+    return [project_dict(project) for project in projects]
@@ -0,0 +1,126 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import event
+
+from metrics import current_route
+
+logger = logging.getLogger(__name__)
+
+# Opt-in: statements slower than this many milliseconds are recorded. Unset or 0 disables the log.
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "0") or 0)
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "200"))
+MAX_RECORDED_PARAMETERS_LENGTH = 2000
+
+_EXPLAIN_PREFIX = {"sqlite": "EXPLAIN QUERY PLAN ", "postgresql": "EXPLAIN "}
+_EXPLAIN_SAVEPOINT = "slow_query_explain"
+
+
+class SlowQueryLog:
+    # The most recent slow statements, newest last; older entries fall off once
+    # SLOW_QUERY_LOG_SIZE is reached.
+
+    def __init__(self, maxlen: int):
+        self._entries: deque = deque(maxlen=max(1, maxlen))
+        self._lock = threading.Lock()
+
+    def record(self, entry: dict) -> None:
+        with self._lock:
+            self._entries.append(entry)
+
+    def entries(self, limit: int, order: str = "slowest") -> List[dict]:
+        with self._lock:
+            entries = list(self._entries)
+        if order == "slowest":
+            entries.sort(key=lambda entry: entry["duration_ms"], reverse=True)
+        else:
+            entries.reverse()
+        return entries[:limit]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_log = SlowQueryLog(SLOW_QUERY_LOG_SIZE)
+
+
+def _is_select(statement: str) -> bool:
+    head = statement.lstrip()[:6].upper()
+    return head == "SELECT" or head.startswith("WITH")
+
+
+def _explain(conn, statement: str, parameters) -> Optional[List[str]]:
+    # Runs on a raw DBAPI cursor so it bypasses these listeners and the ORM. On
+    # PostgreSQL a savepoint keeps a failed EXPLAIN from aborting the caller's
+    # transaction. Only SELECTs are explained; EXPLAIN never executes them.
+    prefix = _EXPLAIN_PREFIX.get(conn.dialect.name)
+    if prefix is None:
+        return None
+    savepoint = conn.dialect.name == "postgresql"
+    cursor = conn.connection.cursor()
+    try:
+        if savepoint:
+            cursor.execute(f"SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+        try:
+            cursor.execute(prefix + statement, parameters)
+            rows = cursor.fetchall()
+        except Exception:
+            if savepoint:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+            raise
+        if savepoint:
+            cursor.execute(f"RELEASE SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+    finally:
+        cursor.close()
+    # SQLite rows are (id, parent, notused, detail); PostgreSQL rows are one text column.
+    return [str(row[-1]) for row in rows]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration_ms = (time.perf_counter() - conn.info["slow_query_started"].pop()) * 1000
+    if duration_ms < SLOW_QUERY_MS:
+        return
+
+    plan = None
+    if not executemany and _is_select(statement):
+        try:
+            plan = _explain(conn, statement, parameters)
+        except Exception as exc:
+            plan = [f"EXPLAIN failed: {exc}"]
+    route = current_route()
+    slow_query_log.record({
+        "recorded_at": datetime.now(timezone.utc),
+        "duration_ms": round(duration_ms, 3),
+        "route": route,
+        "statement": statement,
+        "parameters": repr(parameters)[:MAX_RECORDED_PARAMETERS_LENGTH],
+        "executemany": executemany,
+        "plan": plan,
+    })
+    logger.warning("Slow query (%.1f ms, route %s): %s", duration_ms, route or "-", " ".join(statement.split()))
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("slow_query_started"):
+        conn.info["slow_query_started"].pop()
+
+
+def install_slow_query_log(engine) -> bool:
+    if SLOW_QUERY_MS <= 0:
+        return False
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+    return True
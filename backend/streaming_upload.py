@@ -0,0 +1,147 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+
+from fastapi import HTTPException, Request, status
+from python_multipart.exceptions import FormParserError
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+
+# Allowance on top of the file size for boundaries, part headers and small form fields.
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class ReceivedFile(NamedTuple):
+    path: Path
+    sha256: str
+    size: int
+    extension: str
+
+
+class _FilePartWriter:
+    # MultipartParser callbacks: the part named `field` is hashed and written to a
+    # temporary file as its bytes arrive; other parts are discarded.
+
+    def __init__(self, field: str, directory: Path, max_bytes: int, resolve_extension: Callable[[str, str], str]):
+        self.field = field
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.resolve_extension = resolve_extension
+        self.file = None
+        self.extension: Optional[str] = None
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self._headers = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._writing = False
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def on_part_begin(self) -> None:
+        self._headers = {}
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if options.get(b"name", b"").decode("latin-1") != self.field:
+            return
+        if self.file is not None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Upload a single file.")
+        filename = options.get(b"filename", b"").decode("utf-8", "replace")
+        content_type = self._headers.get(b"content-type", b"").decode("latin-1").strip()
+        # Rejected types fail here, before any of the file is written.
+        self.extension = self.resolve_extension(filename, content_type)
+        self.file = tempfile.NamedTemporaryFile(dir=self.directory, prefix=".upload-", delete=False)
+        self._writing = True
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if not self._writing:
+            return
+        self.size += end - start
+        if self.size > self.max_bytes:
+            raise UploadTooLarge()
+        chunk = data[start:end]
+        self.digest.update(chunk)
+        self.file.write(chunk)
+
+    def on_part_end(self) -> None:
+        self._writing = False
+
+    def discard(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            Path(self.file.name).unlink(missing_ok=True)
+
+
+async def receive_file(
+    request: Request,
+    field: str,
+    directory: Path,
+    max_bytes: int,
+    resolve_extension: Callable[[str, str], str],
+) -> ReceivedFile:
+    # Parses the multipart body straight off the socket instead of letting Starlette
+    # spool it first, so an oversized upload is refused from its Content-Length, or
+    # as soon as it crosses max_bytes, and the file is written to disk only once.
+    media_type, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if media_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Send the file as multipart/form-data in a field named '{field}'.",
+        )
+
+    body_limit = max_bytes + MULTIPART_OVERHEAD_BYTES
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > body_limit:
+        raise UploadTooLarge()
+
+    writer = _FilePartWriter(field, directory, max_bytes, resolve_extension)
+    parser = MultipartParser(boundary, writer.callbacks())
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > body_limit:
+                raise UploadTooLarge()
+            if chunk:
+                await run_in_threadpool(parser.write, chunk)
+        parser.finalize()
+        if writer.file is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Missing file field '{field}'.")
+        writer.file.close()
+    except FormParserError:
+        writer.discard()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Malformed multipart upload.")
+    except BaseException:
+        writer.discard()
+        raise
+
+    os.chmod(writer.file.name, 0o644)
+    return ReceivedFile(Path(writer.file.name), writer.digest.hexdigest(), writer.size, writer.extension)
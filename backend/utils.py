@@ -1,5 +1,29 @@
-import bcrypt
+import asyncio
 import hashlib
+import os
+import secrets
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import bcrypt
+
+# bcrypt releases the GIL while hashing, so a thread pool scales with cores.
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", str(os.cpu_count() or 2)))
+PASSWORD_QUEUE_LIMIT = int(os.getenv("PASSWORD_QUEUE_LIMIT", str(PASSWORD_WORKERS * 4)))
+
+_password_executor = ThreadPoolExecutor(max_workers=PASSWORD_WORKERS, thread_name_prefix="password")
+_password_slots = threading.BoundedSemaphore(PASSWORD_WORKERS + PASSWORD_QUEUE_LIMIT)
+_password_in_flight = 0
+_password_rejected = 0
+_password_lock = threading.Lock()
+
+
+class PasswordPoolSaturated(RuntimeError):
+    pass
+
 
 def hash_pwd(password: str) -> str:
     # Convert password to bytes
@@ -23,4 +47,84 @@ def verify_pwd(plain_password: str, hashed_password: str) -> bool:
         password_bytes = hashlib.sha256(password_bytes).digest()[:72]
     
     hashed_bytes = hashed_password.encode('utf-8')
-    return bcrypt.checkpw(password_bytes, hashed_bytes)
\ No newline at end of file
+    return bcrypt.checkpw(password_bytes, hashed_bytes)
+
+
+def _release_password_slot(_future=None) -> None:
+    global _password_in_flight
+    with _password_lock:
+        _password_in_flight -= 1
+    _password_slots.release()
+
+
+async def _run_password_task(func, *args):
+    global _password_in_flight, _password_rejected
+    if not _password_slots.acquire(blocking=False):
+        with _password_lock:
+            _password_rejected += 1
+        raise PasswordPoolSaturated("Password hashing pool is saturated")
+    with _password_lock:
+        _password_in_flight += 1
+    try:
+        future = _password_executor.submit(func, *args)
+    except BaseException:
+        _release_password_slot()
+        raise
+    # The slot is freed when the hash itself finishes, not when the caller stops
+    # waiting: a cancelled request cannot interrupt bcrypt once it is running.
+    future.add_done_callback(_release_password_slot)
+    return await asyncio.wrap_future(future)
+
+
+async def hash_pwd_async(password: str) -> str:
+    return await _run_password_task(hash_pwd, password)
+
+
+async def verify_pwd_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_password_task(verify_pwd, plain_password, hashed_password)
+
+
+def password_pool_stats() -> dict:
+    with _password_lock:
+        return {
+            "workers": PASSWORD_WORKERS,
+            "capacity": PASSWORD_WORKERS + PASSWORD_QUEUE_LIMIT,
+            "in_flight": _password_in_flight,
+            "rejected": _password_rejected,
+        }
+
+
+_uuid7_lock = threading.Lock()
+_uuid7_last_ms = 0
+_uuid7_counter = 0
+
+
+def uuid7(timestamp_ms: Optional[int] = None) -> uuid.UUID:
+    # RFC 9562 version 7: 48-bit Unix milliseconds, a 12-bit counter so IDs from this
+    # process stay ordered within a millisecond, then 62 random bits.
+    global _uuid7_last_ms, _uuid7_counter
+    if timestamp_ms is None:
+        with _uuid7_lock:
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms > _uuid7_last_ms:
+                _uuid7_last_ms = now_ms
+                _uuid7_counter = secrets.randbits(11)
+            else:
+                _uuid7_counter += 1
+                if _uuid7_counter > 0xFFF:
+                    _uuid7_last_ms += 1
+                    _uuid7_counter = 0
+            timestamp_ms, counter = _uuid7_last_ms, _uuid7_counter
+    else:
+        counter = secrets.randbits(12)
+
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76
+    value |= counter << 64
+    value |= 0b10 << 62
+    value |= secrets.randbits(62)
+    return uuid.UUID(int=value)
+
+
+def new_user_id() -> str:
+    return str(uuid7())
@@ -0,0 +1,75 @@
+import hashlib
+from typing import Iterable, Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from models import ResourceVersion
+
+PROJECTS_KEY = "projects"
+
+
+def applications_key(project_id: str) -> str:
+    return f"project:{project_id}:applications"
+
+
+def volunteers_key(project_id: str) -> str:
+    return f"project:{project_id}:volunteers"
+
+
+def bump_versions(db: Session, keys: Iterable[str]) -> None:
+    # Called before the caller commits so the bump lands in the same transaction as the write.
+    keys = sorted(set(keys))
+    if not keys:
+        return
+    table = ResourceVersion.__table__
+    dialect = db.get_bind().dialect.name
+    rows = [{"key": key, "version": 1} for key in keys]
+
+    if dialect in ("sqlite", "postgresql"):
+        dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.key],
+            set_={"version": table.c.version + 1},
+        )
+        db.execute(stmt, rows)
+        return
+
+    for row in rows:
+        updated = db.execute(update(table).where(table.c.key == row["key"]).values(version=table.c.version + 1))
+        if updated.rowcount == 0:
+            db.execute(insert(table).values(row))
+
+
+def current_version(db: Session, key: str) -> int:
+    return db.scalar(select(ResourceVersion.version).where(ResourceVersion.key == key)) or 0
+
+
+def resource_etag(db: Session, key: str, variant: str = "") -> str:
+    # Strong validator: the resource's write counter plus whatever selects the
+    # representation (query string, page), so each distinct response gets its own tag.
+    version = current_version(db, key)
+    digest = hashlib.sha256(f"{key}\0{variant}".encode("utf-8")).hexdigest()[:16]
+    return f'"{version}-{digest}"'
+
+
+def _if_none_match(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/"x" matches "x".
+    candidates = (tag.strip() for tag in header.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    # Sets the validator on the pending response; returns a 304 to send instead when
+    # the client's cached copy is current.
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    header = request.headers.get("if-none-match")
+    if header and _if_none_match(header, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -87,21 +87,13 @@ export default function AnalyticsPage() {
           "Content-Type": "application/json",
         }
 
-        // Fetch all analytics data
-        const [overviewRes, categoryRes, skillsRes, hoursRes, applicationStatsRes] = await Promise.all([
-          fetch(`${API_URL}/analytics/overview?days=${dateRange}`, { headers }),
-          fetch(`${API_URL}/analytics/projects-by-category?days=${dateRange}`, { headers }),
-          fetch(`${API_URL}/analytics/skills-distribution?days=${dateRange}`, { headers }),
-          fetch(`${API_URL}/analytics/monthly-hours?days=${dateRange}`, { headers }),
-          fetch(`${API_URL}/analytics/application-stats?days=${dateRange}`, { headers }),
-        ])
-
-        if (overviewRes.ok && categoryRes.ok && skillsRes.ok && hoursRes.ok && applicationStatsRes.ok) {
-          const overview = await overviewRes.json()
-          const categoryData = await categoryRes.json()
-          const skillData = await skillsRes.json()
-          const hoursData = await hoursRes.json()
-          const applicationStats = await applicationStatsRes.json()
+        // Fetch every analytics panel in a single request
+        const dashboardRes = await fetch(`${API_URL}/analytics/dashboard?days=${dateRange}`, { headers })
+
+        if (dashboardRes.ok) {
+          const dashboard = await dashboardRes.json()
+          const overview = dashboard.overview || {}
+          const applicationStats = dashboard.application_stats || {}
 
           setAnalytics({
             totalProjects: overview.total_projects || 0,
@@ -109,9 +101,9 @@ export default function AnalyticsPage() {
             totalHours: overview.total_hours || 0,
             totalVolunteers: overview.total_volunteers || 0,
             totalImpact: overview.total_impact || 0,
-            categoryData: categoryData || [],
-            hoursData: hoursData || [],
-            skillData: skillData || [],
+            categoryData: dashboard.projects_by_category || [],
+            hoursData: dashboard.monthly_hours || [],
+            skillData: dashboard.skills_distribution || [],
             applicationStats: {
               total: applicationStats.total || 0,
               pending: applicationStats.pending || 0,
@@ -120,28 +112,8 @@ export default function AnalyticsPage() {
             },
           })
         } else {
-          // Log error details
-          console.error("Analytics API errors:")
-          if (!overviewRes.ok) {
-            const errorText = await overviewRes.text()
-            console.error(`Overview: ${overviewRes.status} - ${errorText}`)
-          }
-          if (!categoryRes.ok) {
-            const errorText = await categoryRes.text()
-            console.error(`Category: ${categoryRes.status} - ${errorText}`)
-          }
-          if (!skillsRes.ok) {
-            const errorText = await skillsRes.text()
-            console.error(`Skills: ${skillsRes.status} - ${errorText}`)
-          }
-          if (!hoursRes.ok) {
-            const errorText = await hoursRes.text()
-            console.error(`Hours: ${hoursRes.status} - ${errorText}`)
-          }
-          if (!applicationStatsRes.ok) {
-            const errorText = await applicationStatsRes.text()
-            console.error(`Applications: ${applicationStatsRes.status} - ${errorText}`)
-          }
+          const errorText = await dashboardRes.text()
+          console.error(`Analytics API error: ${dashboardRes.status} - ${errorText}`)
         }
       } catch (error) {
         console.error("Failed to fetch analytics:", error)
@@ -191,7 +191,7 @@ export default function ProjectsPage() {
               className="bg-white rounded-2xl shadow-md border border-[#f3e8ff] overflow-hidden hover:shadow-xl transition-all"
             >
               <div className="relative h-48">
-                <Image src={project.imageUrl || "/placeholder.svg"} alt={project.title} fill className="object-cover" />
+                <Image src={project.cardImageUrl || project.imageUrl || "/placeholder.svg"} alt={project.title} fill className="object-cover" />
                 <div className="absolute inset-0 bg-gradient-to-t from-black/60 to-transparent" />
                 <div className="absolute bottom-3 left-3 right-3">
                   <h3 className="text-lg font-bold text-white line-clamp-2">{project.title}</h3>
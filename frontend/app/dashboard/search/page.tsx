@@ -1,8 +1,8 @@
 "use client"
 
-import { useState, useMemo } from "react"
+import { useState, useMemo, useEffect, useRef } from "react"
 import { useAuth } from "@/contexts/AuthContext"
-import { useProjects, type Project } from "@/contexts/ProjectsContext"
+import { useProjects, type Project, type ProjectFilters } from "@/contexts/ProjectsContext"
 import {
   Search,
   Filter,
@@ -19,9 +19,11 @@ import {
 import Image from "next/image"
 import { motion, AnimatePresence } from "@/lib/motion"
 
+const DATE_RANGE_DAYS: Record<string, number> = { "This Week": 7, "This Month": 30, "Next 3 Months": 90 }
+
 export default function SearchPage() {
   const { user } = useAuth()
-  const { projects, applyToProject } = useProjects()
+  const { fetchProjectsPage, applyToProject } = useProjects()
 
   const [searchQuery, setSearchQuery] = useState("")
   const [filters, setFilters] = useState({
@@ -42,78 +44,112 @@ export default function SearchPage() {
   const [applicationSuccess, setApplicationSuccess] = useState(false)
   const [skillInput, setSkillInput] = useState("")
 
-  // Get recommended projects based on user skills and interests
-  const recommendedProjects = useMemo(() => {
-    if (!user?.skills?.length && !user?.interests?.length) return []
-
-    return projects
-      .filter((project) => {
-        const matchesSkills = project.skillsNeeded.some((skill) => user.skills?.includes(skill))
-        const matchesInterests = user.interests?.includes(project.category)
-        return matchesSkills || matchesInterests
-      })
-      .slice(0, 3)
-  }, [projects, user])
-
-  // Filter projects
-  const filteredProjects = useMemo(() => {
-    return projects.filter((project) => {
-      const matchesSearch =
-        searchQuery === "" ||
-        project.title.toLowerCase().includes(searchQuery.toLowerCase()) ||
-        project.shortDescription.toLowerCase().includes(searchQuery.toLowerCase()) ||
-        project.category.toLowerCase().includes(searchQuery.toLowerCase())
-
-      const matchesType = filters.projectType === "All" || project.projectType === filters.projectType
-
-      const matchesCategory = filters.category === "All" || project.category === filters.category
-
-      const matchesLocation =
-        filters.location === "" ||
-        project.location?.toLowerCase().includes(filters.location.toLowerCase()) ||
-        project.projectType === "Online"
-
-      const matchesSkills =
-        filters.skills.length === 0 || filters.skills.some((skill) => project.skillsNeeded.includes(skill))
+  const [debouncedQuery, setDebouncedQuery] = useState("")
+  const [results, setResults] = useState<Project[]>([])
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [loading, setLoading] = useState(false)
+  const [recommendedProjects, setRecommendedProjects] = useState<Project[]>([])
+  // Ignores responses from searches the user has already moved on from.
+  const searchRequest = useRef(0)
+
+  useEffect(() => {
+    const timer = setTimeout(() => setDebouncedQuery(searchQuery), 300)
+    return () => clearTimeout(timer)
+  }, [searchQuery])
+
+  // Search, category, type, skills and dates are filtered by the API, one page at a time
+  const serverFilters = useMemo((): ProjectFilters => {
+    const range: ProjectFilters = {}
+    const days = DATE_RANGE_DAYS[filters.dateRange]
+    if (days) {
+      const now = new Date()
+      range.startFrom = now.toISOString().slice(0, 10)
+      range.startTo = new Date(now.getTime() + days * 24 * 60 * 60 * 1000).toISOString().slice(0, 10)
+    }
+    return {
+      ...range,
+      q: debouncedQuery || undefined,
+      category: filters.category === "All" ? undefined : filters.category,
+      projectType: filters.projectType === "All" ? undefined : (filters.projectType as Project["projectType"]),
+      skills: filters.skills,
+    }
+  }, [debouncedQuery, filters.category, filters.projectType, filters.skills, filters.dateRange])
+
+  const loadResults = async (cursor: string | null) => {
+    const request = ++searchRequest.current
+    setLoading(true)
+    try {
+      const page = await fetchProjectsPage(serverFilters, cursor)
+      if (request !== searchRequest.current) return
+      setResults((previous) => (cursor ? [...previous, ...page.projects] : page.projects))
+      setNextCursor(page.nextCursor)
+    } catch (_) {
+      if (request !== searchRequest.current) return
+      if (!cursor) setResults([])
+      setNextCursor(null)
+    } finally {
+      if (request === searchRequest.current) setLoading(false)
+    }
+  }
 
-      const matchesDateRange = (() => {
-        if (filters.dateRange === "All") return true
-        const now = new Date()
-        const startDate = new Date(project.startDate)
+  useEffect(() => {
+    loadResults(null)
+  }, [serverFilters])
 
-        if (filters.dateRange === "This Week") {
-          const weekFromNow = new Date(now.getTime() + 7 * 24 * 60 * 60 * 1000)
-          return startDate >= now && startDate <= weekFromNow
-        }
-        if (filters.dateRange === "This Month") {
-          const monthFromNow = new Date(now.getTime() + 30 * 24 * 60 * 60 * 1000)
-          return startDate >= now && startDate <= monthFromNow
+  // Get recommended projects based on user skills and interests
+  useEffect(() => {
+    if (!user?.skills?.length && !user?.interests?.length) {
+      setRecommendedProjects([])
+      return
+    }
+    let cancelled = false
+    ;(async () => {
+      try {
+        const recommended: Project[] = []
+        if (user.skills?.length) {
+          recommended.push(...(await fetchProjectsPage({ skills: user.skills }, null, 3)).projects)
         }
-        if (filters.dateRange === "Next 3 Months") {
-          const threeMonthsFromNow = new Date(now.getTime() + 90 * 24 * 60 * 60 * 1000)
-          return startDate >= now && startDate <= threeMonthsFromNow
+        if (recommended.length < 3 && user.interests?.length) {
+          recommended.push(...(await fetchProjectsPage({ category: user.interests[0] }, null, 3)).projects)
         }
-        return true
-      })()
-
-      return matchesSearch && matchesType && matchesCategory && matchesLocation && matchesSkills && matchesDateRange
-    })
-  }, [projects, searchQuery, filters])
+        const unique = recommended.filter((p, index) => recommended.findIndex((r) => r.id === p.id) === index)
+        if (!cancelled) setRecommendedProjects(unique.slice(0, 3))
+      } catch (_) {
+        if (!cancelled) setRecommendedProjects([])
+      }
+    })()
+    return () => {
+      cancelled = true
+    }
+  }, [user?.id, user?.skills, user?.interests])
+
+  // The API has no location filter, so location narrows the loaded results
+  const filteredProjects = useMemo(() => {
+    if (filters.location === "") return results
+    const location = filters.location.toLowerCase()
+    return results.filter(
+      (project) => project.location?.toLowerCase().includes(location) || project.projectType === "Online",
+    )
+  }, [results, filters.location])
 
   const handleApply = () => {
     if (!selectedProject || !user) return
 
     // Submit application via context (will call backend if configured)
-    applyToProject(selectedProject.id, {
-      projectId: selectedProject.id,
-      volunteerId: user.id,
-      volunteerName: applicationData.name,
-      volunteerEmail: applicationData.email,
-      volunteerPhone: applicationData.phone,
-      skills: user.skills || [],
-      message: applicationData.message,
-      status: "Pending",
-    })
+    applyToProject(
+      selectedProject.id,
+      {
+        projectId: selectedProject.id,
+        volunteerId: user.id,
+        volunteerName: applicationData.name,
+        volunteerEmail: applicationData.email,
+        volunteerPhone: applicationData.phone,
+        skills: user.skills || [],
+        message: applicationData.message,
+        status: "Pending",
+      },
+      selectedProject,
+    )
 
     setApplicationSuccess(true)
     setShowApplicationForm(false)
@@ -125,7 +161,7 @@ export default function SearchPage() {
   }
 
   const categories = ["All", "Education", "Welfare", "Technology", "Healthcare", "Environment", "Arts & Culture"]
-  const allSkills = Array.from(new Set(projects.flatMap((p) => p.skillsNeeded)))
+  const allSkills = Array.from(new Set([...(user?.skills || []), ...results.flatMap((p) => p.skillsNeeded)]))
   const dateRanges = ["All", "This Week", "This Month", "Next 3 Months"]
 
   return (
@@ -326,7 +362,10 @@ export default function SearchPage() {
         animate={{ opacity: 1, y: 0 }}
         transition={{ duration: 0.5, delay: 0.4 }}
       >
-        <h2 className="text-xl font-bold text-[#1f2937] mb-4">All Opportunities ({filteredProjects.length})</h2>
+        <h2 className="text-xl font-bold text-[#1f2937] mb-4">
+          All Opportunities ({filteredProjects.length}
+          {nextCursor ? "+" : ""})
+        </h2>
         <div className="grid md:grid-cols-2 lg:grid-cols-3 gap-6">
           {filteredProjects.map((project, index) => (
             <motion.div
@@ -340,7 +379,21 @@ export default function SearchPage() {
           ))}
         </div>
 
-        {filteredProjects.length === 0 && (
+        {nextCursor && (
+          <div className="flex justify-center mt-8">
+            <motion.button
+              whileHover={{ scale: 1.02 }}
+              whileTap={{ scale: 0.98 }}
+              onClick={() => loadResults(nextCursor)}
+              disabled={loading}
+              className="bg-[#ec4899] hover:bg-[#db2777] text-white font-semibold py-2 px-6 rounded-lg transition-colors disabled:opacity-60"
+            >
+              {loading ? "Loading..." : "Load more"}
+            </motion.button>
+          </div>
+        )}
+
+        {filteredProjects.length === 0 && !loading && (
           <motion.div
             initial={{ opacity: 0 }}
             animate={{ opacity: 1 }}
@@ -577,7 +630,7 @@ function ProjectCard({ project, onViewDetails }: { project: Project; onViewDetai
       className="bg-white rounded-xl shadow-md border border-[#f3e8ff] overflow-hidden cursor-pointer"
     >
       <div className="relative h-48">
-        <Image src={project.imageUrl || "/placeholder.svg"} alt={project.title} fill className="object-cover" />
+        <Image src={project.cardImageUrl || project.imageUrl || "/placeholder.svg"} alt={project.title} fill className="object-cover" />
         <div className="absolute top-3 right-3">
           <span className="px-3 py-1 bg-white/90 backdrop-blur-sm text-[#ec4899] rounded-full text-xs font-semibold">
             {project.category}
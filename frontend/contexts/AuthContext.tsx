@@ -64,11 +64,8 @@ const sanitizePhone = (value: string) => {
   return hasPlusPrefix ? `+${trimmedDigits}` : trimmedDigits
 }
 
-const normalizeUserId = (rawId: string) => {
-  const id = (rawId || "").trim()
-  if (!id) return ""
-  return id.length === 3 ? id : id.padStart(3, "0").slice(-3)
-}
+// IDs are UUIDv7 strings (legacy accounts may still have 3-digit ones); compare them verbatim.
+const normalizeUserId = (rawId: string) => (rawId || "").trim()
 
 const ensureStringArray = (values: string[] | null | undefined): string[] => {
   if (!Array.isArray(values)) return []
@@ -1,6 +1,7 @@
 "use client"
 
 import { createContext, useContext, useState, useEffect, type ReactNode } from "react"
+import { useAuth } from "./AuthContext"
 
 export interface Project {
   id: string
@@ -14,6 +15,8 @@ export interface Project {
   startDate: string
   endDate: string
   imageUrl: string
+  // Resized WebP rendition for cards; absent until the backend has generated it.
+  cardImageUrl?: string
   creatorId: string
   creatorName: string
   creatorEmail: string
@@ -53,12 +56,62 @@ export interface Application {
   appliedAt: string
 }
 
+// Server-side filters for GET /projects; dates are YYYY-MM-DD bounds on startDate.
+export interface ProjectFilters {
+  q?: string
+  category?: string
+  projectType?: Project["projectType"]
+  skills?: string[]
+  startFrom?: string
+  startTo?: string
+  ownerId?: string
+}
+
+export interface ProjectPage {
+  projects: Project[]
+  // Pass back to fetchProjectsPage for the next page; null on the last one.
+  nextCursor: string | null
+}
+
+export const PROJECTS_PAGE_SIZE = 50
+// Largest page GET /projects serves; used to walk the signed-in user's own projects.
+const MAX_PROJECTS_PAGE_SIZE = 200
+
+// Local-only mode keeps every project in local storage, so filters are applied here.
+const matchesProjectFilters = (project: Project, filters: ProjectFilters): boolean => {
+  const query = filters.q?.trim().toLowerCase()
+  if (
+    query &&
+    !project.title.toLowerCase().includes(query) &&
+    !project.shortDescription.toLowerCase().includes(query) &&
+    !project.category.toLowerCase().includes(query)
+  ) {
+    return false
+  }
+  if (filters.category && project.category !== filters.category) return false
+  if (filters.projectType && project.projectType !== filters.projectType) return false
+  if (filters.ownerId && project.creatorId !== filters.ownerId) return false
+  if (filters.skills?.length) {
+    const wanted = filters.skills.map((skill) => skill.toLowerCase())
+    if (!project.skillsNeeded.some((skill) => wanted.includes(skill.toLowerCase()))) return false
+  }
+  if (filters.startFrom && project.startDate < filters.startFrom) return false
+  if (filters.startTo && project.startDate > filters.startTo) return false
+  return true
+}
+
 interface ProjectsContextType {
+  // The signed-in user's own projects, plus any they applied to from this browser.
   projects: Project[]
+  fetchProjectsPage: (filters: ProjectFilters, cursor?: string | null, limit?: number) => Promise<ProjectPage>
   addProject: (project: Omit<Project, "id" | "volunteers" | "applications">) => void
   updateProject: (id: string, updates: Partial<Project>) => void
   deleteProject: (id: string) => void
-  applyToProject: (projectId: string, application: Omit<Application, "id" | "appliedAt">) => void
+  applyToProject: (
+    projectId: string,
+    application: Omit<Application, "id" | "appliedAt">,
+    project?: Project,
+  ) => void
   updateApplicationStatus: (
     projectId: string,
     applicationId: string,
@@ -184,6 +237,7 @@ const sampleProjects: Project[] = [
 ]
 
 export function ProjectsProvider({ children }: { children: ReactNode }) {
+  const { user } = useAuth()
   const [projects, setProjects] = useState<Project[]>([])
   // Optional backend integration
   const API_URL = process.env.NEXT_PUBLIC_API_URL || ""
@@ -264,27 +318,57 @@ export function ProjectsProvider({ children }: { children: ReactNode }) {
     }
   }
 
+  const fetchProjectsPage = async (
+    filters: ProjectFilters,
+    cursor?: string | null,
+    limit: number = PROJECTS_PAGE_SIZE,
+  ): Promise<ProjectPage> => {
+    if (!API_URL) {
+      return { projects: projects.filter((p) => matchesProjectFilters(p, filters)), nextCursor: null }
+    }
+
+    const token = localStorage.getItem(TOKEN_STORAGE_KEY)
+    const tokenType = localStorage.getItem(TOKEN_TYPE_STORAGE_KEY) || "Bearer"
+    const headers: Record<string, string> = { "Content-Type": "application/json" }
+    if (token) headers["Authorization"] = `${tokenType} ${token}`
+
+    const params = new URLSearchParams({ limit: String(limit) })
+    if (filters.q?.trim()) params.set("q", filters.q.trim())
+    if (filters.category) params.set("category", filters.category)
+    if (filters.projectType) params.set("project_type", filters.projectType)
+    filters.skills?.forEach((skill) => params.append("skill", skill))
+    if (filters.startFrom) params.set("start_from", filters.startFrom)
+    if (filters.startTo) params.set("start_to", filters.startTo)
+    if (filters.ownerId) params.set("owner_id", filters.ownerId)
+    if (cursor) params.set("cursor", cursor)
+
+    const res = await fetch(`${apiBase}/projects?${params.toString()}`, { headers })
+    if (!res.ok) throw new Error(`Failed to fetch projects: ${res.status}`)
+    const apiProjects = await res.json()
+    return {
+      projects: Array.isArray(apiProjects) ? apiProjects.map((p: any) => mapApiProjectToProject(p)) : [],
+      nextCursor: res.headers.get("X-Next-Cursor"),
+    }
+  }
+
   useEffect(() => {
-    // If backend is configured, fetch from API first, else fallback to local storage
+    // If backend is configured, fetch the user's own projects from the API first,
+    // else fallback to local storage. Other projects are paged in by the search page.
     if (API_URL) {
+      if (!user?.id) return
       ;(async () => {
         try {
-          const token = localStorage.getItem(TOKEN_STORAGE_KEY)
-          const tokenType = localStorage.getItem(TOKEN_TYPE_STORAGE_KEY) || "Bearer"
-          const headers: Record<string, string> = { "Content-Type": "application/json" }
-          if (token) headers["Authorization"] = `${tokenType} ${token}`
-
-          const res = await fetch(`${API_URL.replace(/\/$/, "")}/projects`, { headers })
-          if (res.ok) {
-            const apiProjects = await res.json()
-            const mapped: Project[] = Array.isArray(apiProjects)
-              ? apiProjects.map((p: any) => mapApiProjectToProject(p))
-              : []
-            setProjects(mapped)
-            // Also mirror to local storage so UI remains stable offline
-            localStorage.setItem("womenrisehub_projects", JSON.stringify(mapped))
-            return
-          }
+          const own: Project[] = []
+          let cursor: string | null = null
+          do {
+            const page: ProjectPage = await fetchProjectsPage({ ownerId: user.id }, cursor, MAX_PROJECTS_PAGE_SIZE)
+            own.push(...page.projects)
+            cursor = page.nextCursor
+          } while (cursor)
+          setProjects(own)
+          // Also mirror to local storage so UI remains stable offline
+          localStorage.setItem("womenrisehub_projects", JSON.stringify(own))
+          return
         } catch (_) {
           // ignore and fallback
         }
@@ -306,7 +390,7 @@ export function ProjectsProvider({ children }: { children: ReactNode }) {
       setProjects(sampleProjects)
       localStorage.setItem("womenrisehub_projects", JSON.stringify(sampleProjects))
     }
-  }, [])
+  }, [user?.id])
 
   const saveProjects = (updatedProjects: Project[]) => {
     setProjects(updatedProjects)
@@ -339,6 +423,7 @@ export function ProjectsProvider({ children }: { children: ReactNode }) {
       startDate: typeof api.start_date === "string" ? api.start_date : api.startDate,
       endDate: typeof api.end_date === "string" ? api.end_date : api.endDate,
       imageUrl: resolveImageUrl(api.image_url ?? api.imageUrl) ?? "/volunteer-project.jpg",
+      cardImageUrl: resolveImageUrl(api.image_variants?.card_webp) ?? undefined,
       creatorId: owner.id ?? api.owner_id ?? api.creatorId ?? "",
       creatorName: owner.name ?? api.creatorName ?? "",
       creatorEmail: owner.email ?? api.creatorEmail ?? "",
@@ -431,7 +516,15 @@ export function ProjectsProvider({ children }: { children: ReactNode }) {
     saveProjects(projects.filter((p) => p.id !== id))
   }
 
-  const applyToProject = (projectId: string, application: Omit<Application, "id" | "appliedAt">) => {
+  const applyToProject = (
+    projectId: string,
+    application: Omit<Application, "id" | "appliedAt">,
+    project?: Project,
+  ) => {
+    // Search results are not part of `projects`; keep the applied-to project so the
+    // application shows up locally (e.g. for status notifications).
+    const known = projects.some((p) => p.id === projectId) || !project ? projects : [...projects, project]
+
     // If backend URL configured, attempt to submit application to server first
     if (API_URL) {
       ;(async () => {
@@ -470,7 +563,7 @@ export function ProjectsProvider({ children }: { children: ReactNode }) {
               appliedAt: apiApp.applied_at || new Date().toISOString(),
             }
             saveProjects(
-              projects.map((p) =>
+              known.map((p) =>
                 p.id === projectId ? { ...p, applications: [...p.applications, newApplication] } : p,
               ),
             )
@@ -487,7 +580,7 @@ export function ProjectsProvider({ children }: { children: ReactNode }) {
           appliedAt: new Date().toISOString(),
         }
         saveProjects(
-          projects.map((p) => (p.id === projectId ? { ...p, applications: [...p.applications, fallbackApp] } : p)),
+          known.map((p) => (p.id === projectId ? { ...p, applications: [...p.applications, fallbackApp] } : p)),
         )
       })()
       return
@@ -500,7 +593,7 @@ export function ProjectsProvider({ children }: { children: ReactNode }) {
       appliedAt: new Date().toISOString(),
     }
     saveProjects(
-      projects.map((p) => (p.id === projectId ? { ...p, applications: [...p.applications, newApplication] } : p)),
+      known.map((p) => (p.id === projectId ? { ...p, applications: [...p.applications, newApplication] } : p)),
     )
   }
 
@@ -716,6 +809,7 @@ export function ProjectsProvider({ children }: { children: ReactNode }) {
     <ProjectsContext.Provider
       value={{
         projects,
+        fetchProjectsPage,
         addProject,
         updateProject,
         deleteProject,